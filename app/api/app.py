@@ -1,22 +1,58 @@
 """FastAPI application for the API."""
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.api.routes import router as api_router, ws_router
 from app.services.database import db_service
+from app.services.emqx_assistant import emqx_assistant_service
 from app.config import config
+from app.utils.logging import configure_logging
 
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson straight to bytes."""
+
+    def render(self, content: Any) -> bytes:
+        """Serialize the content to JSON bytes."""
+        # Accept non-string dict keys as json.dumps and FastAPI's ORJSONResponse do
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+async def warmup():
+    """Connect to the database and the embedding API before the first request.
+
+    Failures are only logged, so the app still starts offline.
+    """
+    for name, warm in (
+        ("database", db_service.warmup),
+        ("embedding API", emqx_assistant_service.warmup),
+    ):
+        try:
+            await asyncio.to_thread(warm)
+            logger.info(f"Warmed up {name} connection")
+        except Exception as e:
+            logger.warning(f"Could not warm up {name} connection: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI application."""
+    # Worker processes started by uvicorn don't run main(), so set up
+    # logging here too; this only adjusts the level if already configured
+    configure_logging()
+
     # Startup
     logger.info("Application startup: initializing services...")
 
@@ -33,10 +69,16 @@ async def lifespan(app: FastAPI):
     ]
     logger.info(f"Available routes: {routes}")
 
+    # Open connections in the background so startup isn't delayed
+    warmup_task = asyncio.create_task(warmup())
+
     yield
     # Shutdown
+    warmup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup_task
     logger.info("Application shutdown: closing database connections...")
-    db_service.close()
+    await db_service.aclose()
 
 
 # Create FastAPI app
@@ -45,6 +87,7 @@ app = FastAPI(
     description="API for the EMQX Knowledge Base",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
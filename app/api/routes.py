@@ -1,13 +1,13 @@
 """API routes for the application."""
 
 import logging
-import traceback
 import asyncio
 import functools
 import time
 
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 
+from app.api.websocket import WebSocketSender
 from app.models.knowledge import FileType, FileAttachment
 from app.services.emqx_assistant import emqx_assistant_service
 from app.config import config
@@ -37,8 +37,7 @@ def api_error_handler(func):
             logger.error(f"Timeout in {func.__name__}")
             raise HTTPException(status_code=504, detail="Request timed out")
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error in {func.__name__}: {e}")
             raise HTTPException(
                 status_code=500, detail=f"Internal server error: {str(e)}"
             )
@@ -134,6 +133,9 @@ async def chat_websocket(websocket: WebSocket):
     await websocket.accept()
     logger.info("WebSocket chat connection accepted with valid token")
 
+    # All messages to the client go through one queued sender task
+    sender = WebSocketSender(websocket)
+
     # Generate a unique session ID for this connection
     session_id = f"chat_ws_{id(websocket)}_{int(time.time())}"
 
@@ -146,7 +148,7 @@ async def chat_websocket(websocket: WebSocket):
             if data.get("ping") is True:
                 # Refresh the session if it exists
                 emqx_assistant_service.session_manager.refresh_session(session_id)
-                await websocket.send_json({"type": "pong", "data": "pong"})
+                await sender.send({"type": "pong", "data": "pong"})
                 continue
 
             # Get the message content
@@ -175,7 +177,7 @@ async def chat_websocket(websocket: WebSocket):
 
             # The client must provide a question
             if not user_input.strip():
-                await websocket.send_json(
+                await sender.send(
                     {"type": "error", "data": "Message is required"}
                 )
                 continue
@@ -226,11 +228,11 @@ async def chat_websocket(websocket: WebSocket):
 
             # Send appropriate initial message
             if session is None:
-                await websocket.send_json(
+                await sender.send(
                     {"type": "status", "data": "Starting new chat session..."}
                 )
             else:
-                await websocket.send_json(
+                await sender.send(
                     {"type": "status", "data": "Processing your message..."}
                 )
 
@@ -266,21 +268,20 @@ async def chat_websocket(websocket: WebSocket):
                                 logger.info(
                                     "Broker info event received, forwarding to client"
                                 )
-                                await websocket.send_json(event.metadata)
+                                await sender.send(event.metadata)
                             else:
-                                await websocket.send_json(event.metadata)
+                                await sender.send(event.metadata)
                         # Handle token streaming
                         elif hasattr(event, "token") and event.token:
                             # Token streaming event for real-time updates
-                            await websocket.send_json(
+                            await sender.send(
                                 {"type": "token", "data": event.token}
                             )
                         else:
                             # Log unknown event types for debugging
                             logger.debug(f"Unknown event type: {type(event)} - {event}")
                     except Exception as e:
-                        logger.error(f"Error handling event: {e}")
-                        logger.error(traceback.format_exc())
+                        logger.exception(f"Error handling event: {e}")
 
                 # Use the streaming_queue attribute of the context
                 async def listen_for_events():
@@ -305,8 +306,7 @@ async def chat_websocket(websocket: WebSocket):
                                 logger.error("Context has no streaming_queue attribute")
                                 break
                     except Exception as e:
-                        logger.error(f"Error in listen_for_events: {e}")
-                        logger.error(traceback.format_exc())
+                        logger.exception(f"Error in listen_for_events: {e}")
 
                 # Start the event listener
                 event_listener = asyncio.create_task(listen_for_events())
@@ -321,11 +321,11 @@ async def chat_websocket(websocket: WebSocket):
                     event = await workflow_future
 
                     # Send message_complete event to signal completion
-                    await websocket.send_json(
+                    await sender.send(
                         {"type": "message_complete", "data": True}
                     )
 
-                    await websocket.send_json({"type": "status", "data": ""})
+                    await sender.send({"type": "status", "data": ""})
                 finally:
                     # Cancel the event listener
                     event_listener.cancel()
@@ -337,9 +337,8 @@ async def chat_websocket(websocket: WebSocket):
                     pass
 
             except Exception as e:
-                logger.error(f"Error processing chat message: {e}")
-                logger.error(traceback.format_exc())
-                await websocket.send_json(
+                logger.exception(f"Error processing chat message: {e}")
+                await sender.send(
                     {
                         "type": "error",
                         "data": f"Error processing your message: {str(e)}",
@@ -351,11 +350,13 @@ async def chat_websocket(websocket: WebSocket):
         # Clean up the session when the WebSocket disconnects
         emqx_assistant_service.session_manager.delete_session(session_id)
     except Exception as e:
-        logger.error(f"Error in chat WebSocket: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error in chat WebSocket: {e}")
         try:
-            await websocket.send_json({"type": "error", "data": str(e)})
+            await sender.send({"type": "error", "data": str(e)})
             # Keep the connection open for a moment to ensure the error message is sent
             await asyncio.sleep(1)
         except Exception:
             pass  # Client might be disconnected already
+    finally:
+        # Flush queued messages and stop the sender
+        await sender.close()
@@ -0,0 +1,129 @@
+"""Queued message sending for WebSocket connections."""
+
+import asyncio
+import logging
+from contextlib import suppress
+from typing import List, Union
+
+import orjson
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Options matching json.dumps, which accepted non-string dict keys
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Queued items: a serialized frame, a token message still open to merging,
+# or None marking the end of the queue
+QueueItem = Union[bytes, dict, None]
+
+
+def is_token(message) -> bool:
+    """Check whether a message is a plain text token that can be merged."""
+    return (
+        isinstance(message, dict)
+        and message.keys() == {"type", "data"}
+        and message["type"] == "token"
+        and isinstance(message["data"], str)
+    )
+
+
+def coalesce_tokens(messages: List[QueueItem]) -> List[QueueItem]:
+    """Merge runs of consecutive token messages into single messages.
+
+    Args:
+        messages: The messages to send, in order
+
+    Returns:
+        The messages with adjacent tokens joined, order otherwise unchanged
+    """
+    merged = []
+    for message in messages:
+        if merged and is_token(message) and is_token(merged[-1]):
+            merged[-1] = {"type": "token", "data": merged[-1]["data"] + message["data"]}
+        else:
+            merged.append(message)
+    return merged
+
+
+class WebSocketSender:
+    """Send JSON messages to a WebSocket from one long-running task.
+
+    Producers put messages on a bounded per-connection queue instead of
+    writing to the socket themselves. Token messages that pile up while a
+    frame is being sent go out together as one frame.
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int = 1024):
+        """Start the sender task.
+
+        Args:
+            websocket: The accepted WebSocket connection
+            maxsize: Maximum number of queued messages before send() waits
+        """
+        self.websocket = websocket
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._task = asyncio.create_task(self._run())
+
+    async def send(self, message: dict):
+        """Queue a message for sending.
+
+        Args:
+            message: The JSON-serializable message
+
+        Raises:
+            TypeError: If the message can't be serialized; the connection is
+                unaffected
+            Exception: The error that stopped the sender, if sending failed
+        """
+        # Tokens are serialized once merged; anything else is serialized
+        # here, so a bad payload fails only its own send
+        item = message if is_token(message) else orjson.dumps(message, option=_ORJSON_OPTIONS)
+        await self._put(item)
+
+    async def close(self):
+        """Send the messages still queued, then stop the sender task."""
+        with suppress(Exception):
+            await self._put(None)
+            await self._task
+
+    async def _put(self, item: QueueItem):
+        """Queue an item, failing if the sender task has stopped."""
+        self._raise_if_stopped()
+        try:
+            self._queue.put_nowait(item)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # Wait for room in the queue, unless the sender stops meanwhile
+        put = asyncio.ensure_future(self._queue.put(item))
+        await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            self._raise_if_stopped()
+
+    def _raise_if_stopped(self):
+        """Re-raise the send error that stopped the sender, as a direct send would."""
+        if self._task.done():
+            if not self._task.cancelled():
+                self._task.result()
+            raise RuntimeError("WebSocket sender is closed")
+
+    async def _run(self):
+        """Send queued messages until the end marker."""
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            for item in coalesce_tokens(batch):
+                if item is None:
+                    return
+                if isinstance(item, dict):
+                    try:
+                        item = orjson.dumps(item, option=_ORJSON_OPTIONS)
+                    except orjson.JSONEncodeError as e:
+                        logger.error(f"Dropping WebSocket message that can't be serialized: {e}")
+                        continue
+                await self.websocket.send_text(item.decode())
@@ -31,6 +31,9 @@ class Config(BaseModel):
     slack_app_token: Optional[str] = os.getenv("SLACK_APP_TOKEN")
     slack_signing_secret: Optional[str] = os.getenv("SLACK_SIGNING_SECRET")
     slack_team_id: Optional[str] = os.getenv("SLACK_TEAM_ID")
+    slack_max_workers: int = int(
+        os.getenv("SLACK_MAX_WORKERS", "8")
+    )  # threads for blocking work in Slack handlers
 
     # LlamaIndex
     llama_index_verbose: bool = (
@@ -43,6 +46,15 @@ class Config(BaseModel):
     # Server
     host: str = os.getenv("HOST", "0.0.0.0")
     port: int = int(os.getenv("PORT", "3000"))
+    workers: int = int(os.getenv("WORKERS", "1"))  # API server processes
+    keep_alive_timeout: int = int(os.getenv("KEEP_ALIVE_TIMEOUT", "30"))  # seconds
+    limit_concurrency: int = int(os.getenv("LIMIT_CONCURRENCY", "1000"))  # connections per worker
+    backlog: int = int(os.getenv("BACKLOG", "2048"))  # pending TCP connections
+    # Per-request access log lines; off by default in production
+    access_log: bool = (
+        os.getenv("ACCESS_LOG", str(os.getenv("ENVIRONMENT", "production") != "production")).lower()
+        == "true"
+    )
 
     # WebSocket
     websocket_ping_interval: int = int(
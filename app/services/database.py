@@ -1,6 +1,8 @@
 """Database service for PostgreSQL with pg_vector."""
 
+import asyncio
 import logging
+import threading
 from typing import List, Optional, Tuple
 
 from psycopg.rows import dict_row
@@ -16,15 +18,41 @@ class DatabaseService:
     """Service for interacting with the PostgreSQL database."""
 
     def __init__(self):
-        """Initialize the database service."""
-        self.pool = ConnectionPool(
-            config.database_url, min_size=1, max_size=10, open=True
-        )
-        self._initialize_database()
-
-    def _initialize_database(self):
-        """Initialize the database schema if it doesn't exist."""
-        with self.pool.connection() as conn:
+        """Initialize the database service.
+
+        The connection pool is created on first use, so importing the service
+        doesn't connect to the database.
+        """
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Get the connection pool, creating it and the schema on first access."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    pool = ConnectionPool(config.database_url, min_size=1, max_size=10, open=True)
+                    try:
+                        self._initialize_database(pool)
+                    except Exception:
+                        pool.close()
+                        raise
+                    self._pool = pool
+        return self._pool
+
+    @pool.setter
+    def pool(self, pool: ConnectionPool):
+        """Replace the connection pool."""
+        self._pool = pool
+
+    def _initialize_database(self, pool: ConnectionPool):
+        """Initialize the database schema if it doesn't exist.
+
+        Args:
+            pool: The connection pool to initialize the schema with.
+        """
+        with pool.connection() as conn:
             with conn.cursor() as cur:
                 # Check if vector extension is installed
                 cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
@@ -62,6 +90,17 @@ class DatabaseService:
                     """
                 )
 
+                # Create embedding cache table, keyed by a hash of model and text
+                cur.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        key BYTEA PRIMARY KEY,
+                        embedding vector({dimension}) NOT NULL,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                    )
+                    """
+                )
+
                 # Create file attachments table
                 cur.execute(
                     f"""
@@ -294,6 +333,46 @@ class DatabaseService:
                     results.append(FileAttachment.model_validate(row))
                 return results
 
+    def get_cached_embedding(self, key: bytes) -> Optional[List[float]]:
+        """Get a cached embedding by its key.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The embedding if found, None otherwise.
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT embedding::real[] FROM embedding_cache WHERE key = %s",
+                    (key,),
+                )
+                row = cur.fetchone()
+                if row:
+                    return row[0]
+                return None
+
+    def save_cached_embedding(self, key: bytes, embedding: List[float]):
+        """Save an embedding to the cache.
+
+        Args:
+            key: The cache key.
+            embedding: The embedding vector.
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO embedding_cache (key, embedding)
+                    VALUES (%s, %s::vector)
+                    ON CONFLICT (key)
+                    DO UPDATE SET embedding = EXCLUDED.embedding, created_at = NOW()
+                    """,
+                    (key, embedding),
+                )
+                conn.commit()
+
     def delete_knowledge(self, entry_id: int) -> bool:
         """Delete a knowledge entry from the database.
 
@@ -317,10 +396,22 @@ class DatabaseService:
                 conn.commit()
                 return result is not None
 
+    def warmup(self):
+        """Open the connection pool and check a connection with a trivial query."""
+        with self.pool.connection() as conn:
+            conn.execute("SELECT 1")
+
     def close(self):
-        """Close the database connection pool."""
-        if self.pool and not self.pool.closed:
-            self.pool.close()
+        """Close the database connection pool if it was ever opened."""
+        if self._pool is not None and not self._pool.closed:
+            self._pool.close()
+
+    async def aclose(self):
+        """Close the pool from a worker thread, without blocking the event loop.
+
+        Closing waits for connections still in use to be returned.
+        """
+        await asyncio.to_thread(self.close)
 
     def __del__(self):
         """Destructor to ensure pool is closed."""
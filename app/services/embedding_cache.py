@@ -0,0 +1,196 @@
+"""Persistent cache for text embeddings."""
+
+import hashlib
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Optional
+
+from app.config import config
+from app.services.database import db_service
+from app.services.emqx_assistant import emqx_assistant_service
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding requests into batched API calls.
+
+    Texts submitted from any thread are queued and sent to the embedding API
+    together once max_batch texts are waiting or max_wait seconds have passed
+    since the first one arrived.
+    """
+
+    def __init__(self, embedder, max_batch: int = 16, max_wait: float = 0.05):
+        """Initialize the batcher.
+
+        Args:
+            embedder: The service providing create_embeddings_batch.
+            max_batch: Maximum number of texts sent in one request.
+            max_wait: Maximum time in seconds a text waits for a batch to fill.
+        """
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for embedding.
+
+        Args:
+            text: The text to embed.
+
+        Returns:
+            A future resolving to the embedding vector.
+        """
+        # Start the worker thread on first use
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _run(self):
+        """Drain the queue in batches forever."""
+        while True:
+            batch = [self._queue.get()]
+
+            # Collect more texts until the batch is full or the wait is over
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Skip texts whose caller stopped waiting for them
+            batch = [
+                (text, future) for text, future in batch if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+
+            try:
+                embeddings = self.embedder.create_embeddings_batch([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            logger.debug(f"Embedded a batch of {len(batch)} texts")
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
+
+
+class CachedEmbedder:
+    """Embedding lookups backed by an in-process LRU and the database.
+
+    Embeddings are keyed by the SHA-256 of the model name and the text, so
+    a repeated question or an unchanged thread never goes back to the
+    embedding API.
+    """
+
+    def __init__(self, embedder, db, maxsize: int = 2048, timeout: float = 60):
+        """Initialize the cache.
+
+        Args:
+            embedder: The service used to create embeddings on a cache miss.
+            db: The database service used as the persistent tier.
+            maxsize: Maximum number of embeddings kept in memory.
+            timeout: Maximum time in seconds to wait for a batched embedding.
+        """
+        self.embedder = embedder
+        self.db = db
+        self.batcher = EmbeddingBatcher(embedder)
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _model_name(self) -> str:
+        """Get the name of the embedding model in use."""
+        embed_model = getattr(self.embedder, "embed_model", None)
+        return getattr(embed_model, "model_name", None) or config.embedding_model
+
+    def _key(self, text: str) -> bytes:
+        """Build the cache key for a text."""
+        return hashlib.sha256(f"{self._model_name()}\0{text}".encode()).digest()
+
+    def _remember(self, key: bytes, embedding: List[float]):
+        """Store an embedding in the in-process tier."""
+        with self._lock:
+            self._memory[key] = embedding
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def _recall(self, key: bytes) -> Optional[List[float]]:
+        """Look up an embedding in the in-process tier."""
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+            return embedding
+
+    def get_or_compute(self, text: str) -> List[float]:
+        """Get the embedding for a text, creating it only on a cache miss.
+
+        Args:
+            text: The text to embed.
+
+        Returns:
+            The embedding vector.
+
+        Raises:
+            TimeoutError: If the embedding isn't ready within the timeout.
+        """
+        key = self._key(text)
+
+        embedding = self._recall(key)
+        if embedding is not None:
+            return embedding
+
+        try:
+            embedding = self.db.get_cached_embedding(key)
+        except Exception as e:
+            logger.warning(f"Error reading embedding cache: {e}")
+            embedding = None
+
+        if embedding is None:
+            # Misses from concurrent handlers share one API request
+            future = self.batcher.submit(text)
+            try:
+                embedding = future.result(timeout=self.timeout)
+            except TimeoutError:
+                # Drop the text from the queue if it hasn't been sent yet
+                future.cancel()
+                raise
+
+            # Don't persist the zero vector returned when the API call fails
+            if not any(embedding):
+                return embedding
+
+            try:
+                self.db.save_cached_embedding(key, embedding)
+            except Exception as e:
+                logger.warning(f"Error writing embedding cache: {e}")
+
+        self._remember(key, embedding)
+        return embedding
+
+
+# Create a global instance of the embedding cache
+embedding_cache = CachedEmbedder(emqx_assistant_service, db_service)
@@ -1,11 +1,13 @@
 """Service for EMQX Assistant workflows."""
 
 import logging
-import traceback
+import re
 import time
 from typing import List, Union
 import os
 
+import orjson
+
 from llama_index.core.llms import ChatMessage, MessageRole
 from llama_index.core.memory import ChatMemoryBuffer
 from llama_index.core.workflow import (
@@ -21,17 +23,26 @@ from llama_index.core.workflow import (
 from llama_index.core.tools import FunctionTool
 
 from app.utils.emqx_api import EmqxToolWrapper
-from app.utils.network import check_port_available, get_ping_response_time
+from app.utils.network import (
+    check_port_available,
+    check_ports_available,
+    get_ping_response_time,
+)
 
 # Import the OpenAI embeddings
 from llama_index.embeddings.openai import OpenAIEmbedding
 
-from app.models.knowledge import KnowledgeResponse, FileAttachment
+from app.models.knowledge import KnowledgeEntry, KnowledgeResponse, FileAttachment
 from app.services.database import db_service
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+# Input limit of the OpenAI embedding models, in tokens. Every cl100k_base
+# token covers at least one byte of UTF-8, so inputs are split into chunks of
+# at most this many bytes, which fit however the text tokenizes.
+MAX_EMBEDDING_TOKENS = 8191
+
 
 class EmqxQuestionEvent(Event):
     """Event for EMQX question."""
@@ -150,7 +161,12 @@ class SessionManager:
         self.last_accessed = {}
 
     def create_session(
-        self, session_id, llm, file_attachments=None, emqx_credentials=None
+        self,
+        session_id,
+        llm,
+        file_attachments=None,
+        emqx_credentials=None,
+        extra_context=None,
     ):
         """Create a new session.
 
@@ -159,6 +175,7 @@ class SessionManager:
             llm: The LLM to use for this session.
             file_attachments: Optional list of file attachments.
             emqx_credentials: Optional dict with EMQX API credentials (not used currently).
+            extra_context: Optional list of knowledge entries to use as context.
 
         Returns:
             A tuple of (workflow, context, memory).
@@ -178,6 +195,7 @@ class SessionManager:
             memory=memory,
             file_attachments=file_attachments,
             emqx_credentials=emqx_credentials,
+            extra_context=extra_context,
         )
 
         # Create a context
@@ -260,6 +278,7 @@ class EmqxAssistantWorkflow(Workflow):
         memory=None,
         file_attachments=None,
         emqx_credentials=None,
+        extra_context=None,
         *args,
         **kwargs,
     ):
@@ -270,11 +289,13 @@ class EmqxAssistantWorkflow(Workflow):
             memory: Optional chat memory buffer for context
             file_attachments: Optional list of file attachments
             emqx_credentials: Optional dict with EMQX API credentials
+            extra_context: Optional list of knowledge entries to use as context
             *args: Additional arguments
             **kwargs: Additional keyword arguments
         """
         self.memory = memory or ChatMemoryBuffer(token_limit=8000)
         self.file_attachments = file_attachments or []
+        self.extra_context = extra_context or []
 
         # Store EMQX credentials if provided
         self.emqx_credentials = (
@@ -395,15 +416,11 @@ class EmqxAssistantWorkflow(Workflow):
         if credentials_text != "NO_CREDENTIALS" and "{" in credentials_text:
             # Try to parse the JSON response
             try:
-                # Extract the JSON part
-                import json
-                import re
-
                 # Find JSON object in the text
                 json_match = re.search(r"\{.*\}", credentials_text, re.DOTALL)
                 if json_match:
                     json_str = json_match.group(0)
-                    credentials = json.loads(json_str)
+                    credentials = orjson.loads(json_str)
 
                     # Validate the credentials have the required fields
                     if all(
@@ -501,6 +518,7 @@ class EmqxAssistantWorkflow(Workflow):
         similar_entries = db_service.find_similar_entries(
             question_embedding, threshold=0.5, limit=10
         )
+        similar_entries = merge_extra_context(similar_entries, self.extra_context)
 
         # Find similar file attachments if we don't have any attached to this question
         file_attachments = ev.file_attachments or []
@@ -527,13 +545,7 @@ class EmqxAssistantWorkflow(Workflow):
         if similar_entries:
             context += "## Relevant Knowledge Base Entries\n\n"
             for entry, similarity in similar_entries:
-                # Include more context from each entry for better understanding
-                snippet = (
-                    entry.content[:500] + "..."
-                    if len(entry.content) > 500
-                    else entry.content
-                )
-                context += f"**Entry {entry.id}** (Similarity: {similarity:.2f}):\n{snippet}\n\n"
+                context += format_context_entry(entry, similarity)
 
         # Add file attachments
         if file_attachments:
@@ -658,6 +670,7 @@ class EmqxAssistantWorkflow(Workflow):
                     FunctionTool.from_defaults(fn=tool_wrapper.get_cluster_info),
                     FunctionTool.from_defaults(fn=tool_wrapper.get_authentication_info),
                     FunctionTool.from_defaults(fn=check_port_available),
+                    FunctionTool.from_defaults(fn=check_ports_available),
                     FunctionTool.from_defaults(fn=get_ping_response_time),
                 ],
                 llm=self.llm,
@@ -696,8 +709,7 @@ class EmqxAssistantWorkflow(Workflow):
             broker_context = combined_response
 
         except Exception as e:
-            logger.error(f"Error getting broker context: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error getting broker context: {e}")
 
             # Create a more user-friendly error message for connection failures
             broker_context = self.BROKER_CONNECTION_ERROR
@@ -980,7 +992,12 @@ class EmqxAssistantService:
                 logger.error(f"Error initializing LLM: {e}")
 
     async def process_input(
-        self, question: str, session_id: str = None, file_attachments=None
+        self,
+        question: str,
+        session_id: str = None,
+        file_attachments=None,
+        question_embedding: List[float] = None,
+        extra_context: List[KnowledgeEntry] = None,
     ) -> KnowledgeResponse:
         """Answer a question about EMQX or analyze logs using the EmqxAssistantWorkflow.
 
@@ -988,6 +1005,9 @@ class EmqxAssistantService:
             question: The question to answer or logs to analyze
             session_id: Optional session ID for continuing conversations
             file_attachments: Optional file attachments to include
+            question_embedding: Optional precomputed embedding of the question
+            extra_context: Optional knowledge entries to use as context in
+                addition to the stored ones, e.g. a thread that is not saved
 
         Returns:
             The knowledge response
@@ -1005,13 +1025,16 @@ class EmqxAssistantService:
                     file_sources=[],
                 )
 
-            # Create embedding for the question to find possible sources
-            question_embedding = self.create_embedding(question)
+            # Create embedding for the question to find possible sources,
+            # unless the caller already computed it
+            if question_embedding is None:
+                question_embedding = self.create_embedding(question)
 
             # Find similar entries in the knowledge base
             similar_entries = db_service.find_similar_entries(
                 question_embedding, threshold=0.5, limit=8
             )
+            similar_entries = merge_extra_context(similar_entries, extra_context)
 
             # Find similar file attachments if none were provided
             provided_file_attachments = file_attachments or []
@@ -1048,11 +1071,13 @@ class EmqxAssistantService:
                     session_id=session_id,
                     llm=self.llm,
                     file_attachments=all_file_attachments,
+                    extra_context=extra_context,
                 )
             else:
                 workflow, ctx, memory = session
-                # Add file attachments to the existing workflow
+                # Add file attachments and context to the existing workflow
                 workflow.file_attachments = all_file_attachments
+                workflow.extra_context = extra_context or []
 
             # Run the workflow with the question
             handler = await workflow.run(user_input=question, ctx=ctx)
@@ -1087,7 +1112,9 @@ class EmqxAssistantService:
 
             # Extract source information from similar entries
             for entry, similarity in similar_entries:
-                if similarity > 0.6:  # Only include sources with good similarity
+                # Only include stored entries with good similarity; supplied
+                # entries have no similarity and aren't knowledge base sources
+                if similarity is not None and similarity > 0.6:
                     sources.append(entry)
 
             # Extract file sources from the attachments used
@@ -1103,8 +1130,7 @@ class EmqxAssistantService:
             )
 
         except Exception as e:
-            logger.error(f"Error in process_input: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error in process_input: {e}")
             return KnowledgeResponse(
                 question=question,
                 answer=f"I encountered an error while processing your question: {str(e)}",
@@ -1126,6 +1152,10 @@ class EmqxAssistantService:
             if not hasattr(self, "embed_model") or self.embed_model is None:
                 self.embed_model = OpenAIEmbedding()
 
+            # Texts over the input limit are embedded in chunks
+            if len(text.encode("utf-8")) > MAX_EMBEDDING_TOKENS:
+                return self.create_embeddings_batch([text])[0]
+
             # Generate embedding
             embedding = self.embed_model.get_text_embedding(text)
 
@@ -1135,6 +1165,131 @@ class EmqxAssistantService:
             # Return a zero vector of appropriate length as fallback
             return [0.0] * 1536  # Default OpenAI embedding size
 
+    def warmup(self):
+        """Open the connection to the embedding API with a minimal request.
+
+        Unlike create_embedding, errors are raised rather than logged.
+        """
+        if not hasattr(self, "embed_model") or self.embed_model is None:
+            self.embed_model = OpenAIEmbedding()
+        self.embed_model.get_text_embedding("ping")
+
+    def create_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Create embeddings for several texts with a single API request.
+
+        Texts over MAX_EMBEDDING_TOKENS bytes are split into chunks that are
+        embedded in the same request, and their vectors are averaged.
+
+        Args:
+            texts: The texts to create embeddings for.
+
+        Returns:
+            The embedding vectors, in the same order as the texts.
+        """
+        try:
+            # Initialize the embedding model if needed
+            if not hasattr(self, "embed_model") or self.embed_model is None:
+                self.embed_model = OpenAIEmbedding()
+
+            # Split long texts, remembering which chunks belong to which text
+            chunks = []
+            spans = []
+            for text in texts:
+                start = len(chunks)
+                chunks.extend(split_for_embedding(text))
+                spans.append((start, len(chunks)))
+
+            # Generate all embeddings in one request
+            vectors = self.embed_model.get_text_embedding_batch(chunks)
+
+            return [average_embeddings(vectors[start:end]) for start, end in spans]
+        except Exception as e:
+            logger.error(f"Error creating embeddings in service: {e}")
+            # Return zero vectors of appropriate length as fallback
+            return [[0.0] * 1536 for _ in texts]  # Default OpenAI embedding size
+
+
+def split_for_embedding(text: str) -> List[str]:
+    """Split a text into chunks that fit in a single embedding input.
+
+    Args:
+        text: The text to split
+
+    Returns:
+        The chunks of the text, at most MAX_EMBEDDING_TOKENS bytes of UTF-8 each
+    """
+    data = text.encode("utf-8")
+    if len(data) <= MAX_EMBEDDING_TOKENS:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(data):
+        end = min(start + MAX_EMBEDDING_TOKENS, len(data))
+        # Move the cut back so it doesn't split a multi-byte character
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        chunks.append(data[start:end].decode("utf-8"))
+        start = end
+    return chunks
+
+
+def average_embeddings(vectors: List[List[float]]) -> List[float]:
+    """Average the embeddings of the chunks of a text.
+
+    Args:
+        vectors: The chunk embeddings
+
+    Returns:
+        The element-wise mean of the embeddings
+    """
+    if len(vectors) == 1:
+        return vectors[0]
+    return [sum(values) / len(vectors) for values in zip(*vectors)]
+
+
+def merge_extra_context(similar_entries, extra_context):
+    """Merge caller-supplied knowledge entries into similarity search results.
+
+    Supplied entries come first with a similarity of None, as they don't come
+    from the knowledge base, and any stored copy of the same thread is dropped
+    from the search results.
+
+    Args:
+        similar_entries: List of (entry, similarity) tuples from the database
+        extra_context: Optional list of knowledge entries to add
+
+    Returns:
+        The merged list of (entry, similarity) tuples
+    """
+    if not extra_context:
+        return similar_entries
+
+    supplied = {(entry.channel_id, entry.thread_ts) for entry in extra_context}
+    return [(entry, None) for entry in extra_context] + [
+        (entry, similarity)
+        for entry, similarity in similar_entries
+        if (entry.channel_id, entry.thread_ts) not in supplied
+    ]
+
+
+def format_context_entry(entry, similarity) -> str:
+    """Format a knowledge entry for the LLM context.
+
+    Args:
+        entry: The knowledge entry
+        similarity: The similarity from the search, or None for a supplied entry
+
+    Returns:
+        The entry heading and a snippet of its content
+    """
+    # Include more context from each entry for better understanding
+    snippet = entry.content[:500] + "..." if len(entry.content) > 500 else entry.content
+    if similarity is None:
+        # Supplied entries, like the thread being analyzed, aren't stored
+        return f"**Current thread**:\n{snippet}\n\n"
+    return f"**Entry {entry.id}** (Similarity: {similarity:.2f}):\n{snippet}\n\n"
+
 
 def load_prompt(filename):
     """Load a prompt from a file.
@@ -3,33 +3,188 @@
 import logging
 import re
 import asyncio
-import threading
-import traceback
+import functools
+import operator
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.aiohttp import AsyncSocketModeHandler
 
 from app.config import config
 from app.models.knowledge import KnowledgeEntry
 from app.services.database import db_service
+from app.services.embedding_cache import embedding_cache
 from app.services.file_service import file_service
 from app.services.emqx_assistant import emqx_assistant_service
 
 logger = logging.getLogger(__name__)
 
+# Bot mentions such as "<@U012ABCDEF> "
+_MENTION_RE = re.compile(r"<@[A-Z0-9]+>\s*")
+
+# Patterns for general help about the bot itself, not for analyzing a thread
+_HELP_PATTERNS = (
+    r"^help$",  # Just the word "help" by itself
+    r"^what can you do$",
+    r"^what do you do$",
+    r"^how do you work$",
+    r"^how to use$",
+    r"capabilities",
+    r"features",
+    r"commands",
+    r"usage",
+    r"instructions",
+    r"tell me about yourself",
+    r"what are you",
+)
+
+# Patterns for requests to analyze the current thread
+_ANALYZE_PATTERNS = (
+    r"help here",
+    r"analyze( this)? thread",
+    r"summarize( this)? thread",
+    r"assist( with)? this( thread)?",
+    r"help( with)? this( thread)?",
+    r"what('s| is) (happening|going on)( here)?",
+    r"can you (help|assist)( me)?( with this)?",
+    r"check this( thread)?( out)?",
+)
+
+# Each pattern list combined into one alternation, so a message is scanned once
+_HELP_RE = re.compile("|".join(f"(?:{p})" for p in _HELP_PATTERNS), re.IGNORECASE)
+_ANALYZE_RE = re.compile("|".join(f"(?:{p})" for p in _ANALYZE_PATTERNS), re.IGNORECASE)
+
+# Substrings at least one of which appears in any message matched by the help
+# and analyze patterns, used to skip the regexes for ordinary questions
+_HELP_HINTS = (
+    "help",
+    "what can you do",
+    "what do you do",
+    "how do you work",
+    "how to use",
+    "capabilities",
+    "features",
+    "commands",
+    "usage",
+    "instructions",
+    "tell me about yourself",
+    "what are you",
+)
+_ANALYZE_HINTS = (
+    "help",
+    "analyze",
+    "summarize",
+    "assist",
+    "what's",
+    "what is",
+    "check this",
+)
+_COMMAND_HINTS = tuple(dict.fromkeys(_HELP_HINTS + _ANALYZE_HINTS))
+
+# Thanks and acknowledgements, answered without searching the knowledge base
+_ACKNOWLEDGEMENT_RE = re.compile(
+    r"^(?:thanks|thank you|thx|ok|okay|cool|nice|great|got it)"
+    r"(?:\s+(?:a lot|so much))?[\s!.,]*$",
+    re.IGNORECASE,
+)
+
+# Maximum number of messages from a thread included in a thread analysis
+_ANALYZE_MAX_MESSAGES = 50
+
+
+# Reply to general help requests
+_HELP_TEXT = (
+    "*EMQX Knowledge Bot*\n\n"
+    "I help your team capture and retrieve valuable knowledge from Slack conversations.\n\n"
+    "*What I can do:*\n"
+    "- Save important Slack threads to a searchable knowledge base\n"
+    "- Analyze ongoing threads to provide assistance without saving them\n"
+    "- Answer questions based on previously saved knowledge\n"
+    "- Provide source links to original conversations\n"
+    "- Reference official EMQX documentation when appropriate\n"
+    "- Recognize version-specific questions (e.g., 'How to configure auth in EMQX 5.0?')\n"
+    "- Provide information about EMQX Kubernetes deployments using the Operator\n"
+    "- Use AI to generate relevant responses based on your team's specific knowledge\n\n"
+    "*How to use me:*\n"
+    "- To save a thread: Add a 📚 reaction to any message or mention me with `@KnowledgeBot save`\n"
+    "- To analyze a thread: Mention me with `@KnowledgeBot help with this` or similar phrases\n"
+    "- To ask a question: Mention me with your question like `@KnowledgeBot What's the solution for...?`\n"
+    "- For version-specific help: Include the version number in your question (e.g., `@KnowledgeBot How to use rule engine in EMQX 4.3?`)\n"
+    "- For Kubernetes help: Include terms like 'Kubernetes', 'K8s', or 'Operator' in your question\n\n"
+    "*What I cannot do:*\n"
+    "- Automatically save all conversations (I only save threads when explicitly requested)\n"
+    "- Answer questions outside the scope of saved knowledge and official documentation\n"
+    "- Access private channels or conversations I'm not invited to"
+)
+
+
+def _strip_mention_fast(text: str) -> Optional[str]:
+    """Remove the leading bot mention from a message without using a regex.
+
+    Args:
+        text: The raw message text, usually starting with "<@BOTID>".
+
+    Returns:
+        The lowercased message without the mention, or None if the text
+        contains further mentions that need the full regex.
+    """
+    i = text.find(">")
+    if i != -1 and text.startswith("<@"):
+        message = text[i + 1 :].strip()
+    else:
+        message = text.strip()
+    if "<@" in message:
+        return None
+    return message.lower()
+
 
 class SlackService:
     """Service for interacting with Slack API."""
 
     def __init__(self):
         """Initialize the Slack service."""
-        self.app = App(
+        self.app = AsyncApp(
             token=config.slack_bot_token,
             signing_secret=config.slack_signing_secret,
         )
         self.client = self.app.client
+
+        # Short-lived cache of thread messages keyed by (channel_id, thread_ts),
+        # so back-to-back handlers on the same thread share one Slack API call;
+        # least recently used threads are evicted past the size cap
+        self._replies_cache = OrderedDict()
+        self._replies_cache_size = 256
+
+        # Bounded pool for the blocking work (OpenAI, database and file
+        # downloads) done by the event handlers, so bursts reuse a fixed set
+        # of threads instead of growing the default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.slack_max_workers, thread_name_prefix="slack-worker"
+        )
+
+        # Constant start of the Slack deep links to source threads
+        self._link_prefix = f"<slack://channel?team={config.slack_team_id}&id="
+
         self._register_handlers()
 
+    def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call on the Slack worker pool.
+
+        Args:
+            func: The function to call.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            A future resolving to the function's return value.
+        """
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
     def _register_handlers(self):
         """Register event handlers for Slack events."""
         # Handle app mentions (direct messages to the bot)
@@ -41,7 +196,7 @@ class SlackService:
         # Handle file shared events
         self.app.event("file_shared")(self._handle_file_shared)
 
-    def _handle_app_mention(self, body, say, context):
+    async def _handle_app_mention(self, body, say, context):
         """Handle app mention events.
 
         Args:
@@ -56,96 +211,36 @@ class SlackService:
         user_id = event["user"]
 
         # Extract the actual message (remove the bot mention)
-        message = re.sub(r"<@[A-Z0-9]+>\s*", "", text).strip().lower()
+        message = _strip_mention_fast(text)
+        if message is None:
+            message = _MENTION_RE.sub("", text).strip().lower()
 
         # Check if this is a request to save the thread
         # Now matches just "save" or variations like "save this", "save thread",
         # etc.
         if message == "save" or message.startswith("save "):
-            self._save_thread(channel_id, thread_ts, user_id, say)
+            await self._save_thread(channel_id, thread_ts, user_id, say)
+            return
+
+        # Most mentions are plain questions; route them without trying the
+        # analyze and help patterns when none of their hints appear
+        if not any(hint in message for hint in _COMMAND_HINTS):
+            await self._process_input(text, channel_id, thread_ts, say, event)
             return
 
         # Check if this is a request to analyze the current thread
         # This check needs to come before the general help request check
         if self._is_analyze_thread_request(message):
-            # Use a synchronous wrapper to run the async function
-            self._run_async_analyze_thread(channel_id, thread_ts, user_id, say)
+            await self._analyze_thread(channel_id, thread_ts, user_id, say, event)
             return
 
         # Check if this is a general help request
         if self._is_help_request(message):
-            self._send_help_message(thread_ts, say)
+            await self._send_help_message(thread_ts, say)
             return
 
         # Otherwise, treat it as a question
-        # Use a synchronous wrapper to run the async function
-        self._run_async_process_input(text, channel_id, thread_ts, say)
-
-    def _run_async_analyze_thread(self, channel_id, thread_ts, user_id, say):
-        """Synchronous wrapper to run the async analyze_thread function."""
-        try:
-            # Helper function to run in a new event loop
-            def run_in_new_loop():
-                # Create and set a new event loop
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-                try:
-                    # Run the async function to completion with proper awaiting
-                    coroutine = self._analyze_thread(
-                        channel_id, thread_ts, user_id, say
-                    )
-                    loop.run_until_complete(coroutine)
-                except Exception as e:
-                    logger.error(f"Error in analyze_thread: {e}")
-                    logger.error(traceback.format_exc())
-                finally:
-                    # Close the loop
-                    loop.close()
-
-            # Run in a separate thread to avoid blocking
-            thread = threading.Thread(target=run_in_new_loop)
-            thread.daemon = True
-            thread.start()
-
-        except Exception as e:
-            logger.error(f"Error running async analyze_thread: {e}")
-            say(
-                text="I encountered an error while trying to analyze this thread.",
-                thread_ts=thread_ts,
-            )
-
-    def _run_async_process_input(self, text, channel_id, thread_ts, say):
-        """Synchronous wrapper to run the async process_input function."""
-        try:
-            # Helper function to run in a new event loop
-            def run_in_new_loop():
-                # Create and set a new event loop
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-                try:
-                    # Run the async function to completion with proper awaiting
-                    coroutine = self._process_input(text, channel_id, thread_ts, say)
-                    loop.run_until_complete(coroutine)
-                except Exception as e:
-                    logger.error(f"Error in process_input: {e}")
-                    logger.error(traceback.format_exc())
-                finally:
-                    # Close the loop
-                    loop.close()
-
-            # Run in a separate thread to avoid blocking
-            thread = threading.Thread(target=run_in_new_loop)
-            thread.daemon = True
-            thread.start()
-
-        except Exception as e:
-            logger.error(f"Error running async process_input: {e}")
-            say(
-                text="I encountered an error while trying to answer your question.",
-                thread_ts=thread_ts,
-            )
+        await self._process_input(text, channel_id, thread_ts, say, event)
 
     def _is_help_request(self, message: str) -> bool:
         """Check if the message is a general help request.
@@ -156,66 +251,25 @@ class SlackService:
         Returns:
             True if the message is a general help request, False otherwise.
         """
-        # These patterns are for general help about the bot itself, not for
-        # analyzing a thread
-        help_patterns = [
-            r"^help$",  # Just the word "help" by itself
-            r"^what can you do$",
-            r"^what do you do$",
-            r"^how do you work$",
-            r"^how to use$",
-            r"capabilities",
-            r"features",
-            r"commands",
-            r"usage",
-            r"instructions",
-            r"tell me about yourself",
-            r"what are you",
-        ]
-
-        for pattern in help_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                return True
-
-        return False
-
-    def _send_help_message(self, thread_ts: str, say):
+        lowered = message.lower()
+        if not any(hint in lowered for hint in _HELP_HINTS):
+            return False
+
+        return bool(_HELP_RE.search(message))
+
+    async def _send_help_message(self, thread_ts: str, say):
         """Send a help message explaining what the bot can do.
 
         Args:
             thread_ts: The thread timestamp.
             say: Function to send a message to the channel.
         """
-        help_text = (
-            "*EMQX Knowledge Bot*\n\n"
-            "I help your team capture and retrieve valuable knowledge from Slack conversations.\n\n"
-            "*What I can do:*\n"
-            "- Save important Slack threads to a searchable knowledge base\n"
-            "- Analyze ongoing threads to provide assistance without saving them\n"
-            "- Answer questions based on previously saved knowledge\n"
-            "- Provide source links to original conversations\n"
-            "- Reference official EMQX documentation when appropriate\n"
-            "- Recognize version-specific questions (e.g., 'How to configure auth in EMQX 5.0?')\n"
-            "- Provide information about EMQX Kubernetes deployments using the Operator\n"
-            "- Use AI to generate relevant responses based on your team's specific knowledge\n\n"
-            "*How to use me:*\n"
-            "- To save a thread: Add a 📚 reaction to any message or mention me with `@KnowledgeBot save`\n"
-            "- To analyze a thread: Mention me with `@KnowledgeBot help with this` or similar phrases\n"
-            "- To ask a question: Mention me with your question like `@KnowledgeBot What's the solution for...?`\n"
-            "- For version-specific help: Include the version number in your question (e.g., `@KnowledgeBot How to use rule engine in EMQX 4.3?`)\n"
-            "- For Kubernetes help: Include terms like 'Kubernetes', 'K8s', or 'Operator' in your question\n\n"
-            "*What I cannot do:*\n"
-            "- Automatically save all conversations (I only save threads when explicitly requested)\n"
-            "- Answer questions outside the scope of saved knowledge and official documentation\n"
-            "- Access private channels or conversations I'm not invited to"
-        )
-
-        say(
-            text=help_text,
+        await say(
+            text=_HELP_TEXT,
             thread_ts=thread_ts,
         )
 
-    def _handle_reaction_added(self, body, say, context):
+    async def _handle_reaction_added(self, body, say, context):
         """Handle reaction added events.
 
         Args:
@@ -233,9 +287,9 @@ class SlackService:
         if reaction == config.save_emoji and item["type"] == "message":
             channel_id = item["channel"]
             thread_ts = item.get("thread_ts", item["ts"])
-            self._save_thread(channel_id, thread_ts, user_id, say)
+            await self._save_thread(channel_id, thread_ts, user_id, say)
 
-    def _handle_file_shared(self, body, say, context):
+    async def _handle_file_shared(self, body, say, context):
         """Handle file shared events.
 
         Args:
@@ -251,7 +305,7 @@ class SlackService:
 
         try:
             # Get file info
-            file_info = self.client.files_info(file=file_id)
+            file_info = await self.client.files_info(file=file_id)
 
             if not file_info["ok"]:
                 logger.error(f"Failed to get file info: {file_info}")
@@ -273,7 +327,8 @@ class SlackService:
             logger.info(f"Processing file: {file_name} in thread {thread_ts}")
 
             # Process and save the file attachment
-            attachment = file_service.process_file(
+            attachment = await self._run_blocking(
+                file_service.process_file,
                 file_url=file_url,
                 file_name=file_name,
                 channel_id=channel_id,
@@ -287,7 +342,136 @@ class SlackService:
         except Exception as e:
             logger.error(f"Error processing file: {e}")
 
-    def _save_thread(self, channel_id: str, thread_ts: str, user_id: str, say):
+    async def _get_thread_messages(
+        self,
+        channel_id: str,
+        thread_ts: str,
+        ttl: float = 60,
+        event: Optional[dict] = None,
+    ):
+        """Get all messages in a thread, reusing a recent result if available.
+
+        Args:
+            channel_id: The channel ID.
+            thread_ts: The thread timestamp.
+            ttl: Maximum age in seconds of a cached result; 0 always refetches.
+            event: The message event that triggered the request. It is added to
+                a cached result that predates it.
+
+        Returns:
+            The list of messages in the thread, or an empty list if none were found.
+        """
+        key = (channel_id, thread_ts)
+        now = time.monotonic()
+
+        cached = self._replies_cache.get(key)
+        if cached and now - cached[0] < ttl:
+            fetched_at, messages = cached
+            # A mention posted since the fetch is added to the thread rather
+            # than fetching the whole thread again
+            if event is not None and float(event["ts"]) > float(messages[-1]["ts"]):
+                messages = messages + [event]
+                self._replies_cache[key] = (fetched_at, messages)
+            self._replies_cache.move_to_end(key)
+            return messages
+
+        # Follow the cursor so long threads are not silently truncated
+        messages = []
+        cursor = None
+        while True:
+            try:
+                response = await self.client.conversations_replies(
+                    channel=channel_id,
+                    ts=thread_ts,
+                    cursor=cursor,
+                    limit=200,
+                )
+            except Exception as e:
+                if not messages:
+                    raise
+                # Keep the pages already fetched, but don't cache a partial thread
+                logger.warning(f"Error fetching more replies for thread {thread_ts}: {e}")
+                return messages
+
+            if not response["ok"]:
+                # Keep the pages already fetched, but don't cache a partial thread
+                return messages
+
+            messages.extend(response["messages"])
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                break
+
+        if not messages:
+            return []
+
+        self._replies_cache[key] = (now, messages)
+        self._replies_cache.move_to_end(key)
+        if len(self._replies_cache) > self._replies_cache_size:
+            self._replies_cache.popitem(last=False)
+
+        return messages
+
+    def _format_thread_content(self, messages) -> str:
+        """Combine the messages of a thread into a single text.
+
+        Args:
+            messages: The messages in the thread.
+
+        Returns:
+            The thread content, one "<@USER>: text" block per message.
+        """
+        users = [msg.get("user", "UNKNOWN") for msg in messages]
+
+        # Format each author's prefix once; the same users post many times
+        prefix_by_user = {user: f"<@{user}>: " for user in set(users)}
+        return "\n\n".join(
+            map(
+                operator.add,
+                map(prefix_by_user.__getitem__, users),
+                (msg.get("text", "") for msg in messages),
+            )
+        )
+
+    async def _acknowledge(self, text: str, thread_ts: str, say):
+        """Post a placeholder reply while slower work runs.
+
+        Args:
+            text: The placeholder text.
+            thread_ts: The thread timestamp.
+            say: Function to send a message to the channel.
+
+        Returns:
+            The timestamp of the placeholder message, or None if it wasn't posted.
+        """
+        try:
+            response = await say(text=text, thread_ts=thread_ts)
+            return response.get("ts") if response else None
+        except Exception as e:
+            logger.warning(f"Error posting acknowledgement: {e}")
+            return None
+
+    async def _reply(
+        self, text: str, channel_id: str, thread_ts: str, say, ack_ts=None
+    ):
+        """Send the final reply, replacing the placeholder if one was posted.
+
+        Args:
+            text: The reply text.
+            channel_id: The channel ID.
+            thread_ts: The thread timestamp.
+            say: Function to send a message to the channel.
+            ack_ts: The timestamp of the placeholder message, if any.
+        """
+        if ack_ts:
+            try:
+                await self.client.chat_update(channel=channel_id, ts=ack_ts, text=text)
+                return
+            except Exception as e:
+                logger.warning(f"Error updating acknowledgement: {e}")
+        await say(text=text, thread_ts=thread_ts)
+
+    async def _save_thread(self, channel_id: str, thread_ts: str, user_id: str, say):
         """Save a thread to the knowledge base.
 
         Args:
@@ -296,31 +480,30 @@ class SlackService:
             user_id: The user ID who initiated the save.
             say: Function to send a message to the channel.
         """
+        ack_ts = None
         try:
-            # Get all messages in the thread
-            response = self.client.conversations_replies(
-                channel=channel_id,
-                ts=thread_ts,
-            )
+            # Get all messages in the thread, bypassing the cache since the
+            # saved content has to include the latest replies
+            messages = await self._get_thread_messages(channel_id, thread_ts, ttl=0)
 
-            if not response["ok"] or not response["messages"]:
-                say(
+            if not messages:
+                await say(
                     text="I couldn't find any messages in this thread.",
                     thread_ts=thread_ts,
                 )
                 return
 
-            # Combine all messages into a single text
-            messages = response["messages"]
-            thread_content = "\n\n".join(
-                [
-                    f"<@{msg.get('user', 'UNKNOWN')}>: {msg.get('text', '')}"
-                    for msg in messages
-                ]
+            # Let the user know right away; embedding and files can take a while
+            ack_ts = await self._acknowledge(
+                "Saving this thread to the knowledge base...", thread_ts, say
             )
 
-            # Create embedding for the thread content
-            embedding = emqx_assistant_service.create_embedding(thread_content)
+            # Combine all messages into a single text
+            thread_content = self._format_thread_content(messages)
+
+            # Create the embedding, reused from the cache when the thread is
+            # re-saved unchanged
+            embedding = await self._run_blocking(embedding_cache.get_or_compute, thread_content)
 
             # Create and save the knowledge entry
             entry = KnowledgeEntry(
@@ -331,47 +514,63 @@ class SlackService:
                 embedding=embedding,
             )
 
-            entry_id = db_service.save_knowledge(entry)
+            entry_id = await self._run_blocking(db_service.save_knowledge, entry)
 
-            # Process any files in the thread
-            file_count = 0
+            # Process any files in the thread concurrently
+            pending = []
             for message in messages:
                 if "files" in message:
                     for file in message["files"]:
-                        file_url = file.get("url_private")
-                        file_name = file.get("name")
-
                         # Process and save the file attachment
-                        attachment = file_service.process_file(
-                            file_url=file_url,
-                            file_name=file_name,
-                            channel_id=channel_id,
-                            thread_ts=thread_ts,
-                            user_id=message.get("user", user_id),
+                        pending.append(
+                            self._run_blocking(
+                                file_service.process_file,
+                                file_url=file.get("url_private"),
+                                file_name=file.get("name"),
+                                channel_id=channel_id,
+                                thread_ts=thread_ts,
+                                user_id=message.get("user", user_id),
+                            )
                         )
 
-                        if attachment:
-                            file_count += 1
+            attachments = await asyncio.gather(*pending)
+            file_count = sum(1 for attachment in attachments if attachment)
 
             if file_count > 0:
-                say(
-                    text=f"I've saved this thread to the knowledge base (ID: {entry_id}) along with {file_count} file attachments.",
-                    thread_ts=thread_ts,
+                await self._reply(
+                    f"I've saved this thread to the knowledge base (ID: {entry_id}) along with {file_count} file attachments.",
+                    channel_id,
+                    thread_ts,
+                    say,
+                    ack_ts,
                 )
             else:
-                say(
-                    text=f"I've saved this thread to the knowledge base (ID: {entry_id}).",
-                    thread_ts=thread_ts,
+                await self._reply(
+                    f"I've saved this thread to the knowledge base (ID: {entry_id}).",
+                    channel_id,
+                    thread_ts,
+                    say,
+                    ack_ts,
                 )
 
         except Exception as e:
             logger.error(f"Error saving thread: {e}")
-            say(
-                text="I encountered an error while trying to save this thread.",
-                thread_ts=thread_ts,
+            await self._reply(
+                "I encountered an error while trying to save this thread.",
+                channel_id,
+                thread_ts,
+                say,
+                ack_ts,
             )
 
-    async def _process_input(self, text: str, channel_id: str, thread_ts: str, say):
+    async def _process_input(
+        self,
+        text: str,
+        channel_id: str,
+        thread_ts: str,
+        say,
+        event: Optional[dict] = None,
+    ):
         """Answer a question using the knowledge base.
 
         Args:
@@ -379,35 +578,59 @@ class SlackService:
             channel_id: The channel ID.
             thread_ts: The thread timestamp.
             say: Function to send a message to the channel.
+            event: The message event asking the question.
         """
         try:
             # Extract the actual question (remove the bot mention)
-            question = re.sub(r"<@[A-Z0-9]+>\s*", "", text).strip()
+            question = _MENTION_RE.sub("", text).strip()
+
+            # Reply to thanks and acknowledgements without any API calls
+            if _ACKNOWLEDGEMENT_RE.match(question):
+                await say(
+                    text="You're welcome! Let me know if you have any other questions.",
+                    thread_ts=thread_ts,
+                )
+                return
 
             # If the question is too short or doesn't seem like a question, ask for clarification
             if len(question) < 5 or not any(
                 q in question.lower()
                 for q in ["?", "what", "how", "why", "when", "where", "who"]
             ):
-                say(
+                await say(
                     text="I'm not sure what you're asking. Could you please rephrase your question?",
                     thread_ts=thread_ts,
                 )
                 return
 
+            # Embed the question and search for similar files while the thread's
+            # own files are fetched and processed, as neither depends on the other
+            search_task = asyncio.create_task(self._search_similar_files(question))
+
             # Check if there are files in the current thread that need to be processed
             thread_file_attachments = []
             try:
                 # Get all messages in the thread
-                response = self.client.conversations_replies(
-                    channel=channel_id,
-                    ts=thread_ts,
-                )
-
-                if response["ok"] and response["messages"]:
-                    messages = response["messages"]
+                messages = await self._get_thread_messages(channel_id, thread_ts, event=event)
+
+                if messages:
+                    # Look up the files already saved for this thread once
+                    existing_attachments = (
+                        await self._run_blocking(
+                            db_service.get_file_attachments_by_thread,
+                            channel_id,
+                            thread_ts,
+                        )
+                        if any("files" in message for message in messages)
+                        else []
+                    )
+                    # Index by name, keeping the first match for duplicate names
+                    existing_by_name = {
+                        a.file_name: a for a in reversed(existing_attachments)
+                    }
 
                     # Process any files in the thread
+                    pending = []
                     for message in messages:
                         if "files" in message:
                             for file in message["files"]:
@@ -419,19 +642,7 @@ class SlackService:
                                 )
 
                                 # First check if the file is already in the database
-                                existing_attachments = (
-                                    db_service.get_file_attachments_by_thread(
-                                        channel_id, thread_ts
-                                    )
-                                )
-                                existing_file = next(
-                                    (
-                                        a
-                                        for a in existing_attachments
-                                        if a.file_name == file_name
-                                    ),
-                                    None,
-                                )
+                                existing_file = existing_by_name.get(file_name)
 
                                 if existing_file:
                                     logger.info(
@@ -440,87 +651,104 @@ class SlackService:
                                     thread_file_attachments.append(existing_file)
                                 else:
                                     # Process and save the file attachment
-                                    attachment = file_service.process_file(
-                                        file_url=file_url,
-                                        file_name=file_name,
-                                        channel_id=channel_id,
-                                        thread_ts=thread_ts,
-                                        user_id=message.get("user"),
+                                    pending.append(
+                                        self._run_blocking(
+                                            file_service.process_file,
+                                            file_url=file_url,
+                                            file_name=file_name,
+                                            channel_id=channel_id,
+                                            thread_ts=thread_ts,
+                                            user_id=message.get("user"),
+                                        )
                                     )
 
-                                    if attachment:
-                                        logger.info(
-                                            f"File attachment processed for question: {attachment.id}"
-                                        )
-                                        thread_file_attachments.append(attachment)
+                    for attachment in await asyncio.gather(*pending):
+                        if attachment:
+                            logger.info(
+                                f"File attachment processed for question: {attachment.id}"
+                            )
+                            thread_file_attachments.append(attachment)
             except Exception as e:
                 logger.error(f"Error processing files in thread for question: {e}")
                 # Continue with the question answering even if file processing fails
 
-            # Create embedding for the question to find similar entries
-            embedding = emqx_assistant_service.create_embedding(question)
-
-            # Find similar file attachments
-            similar_files = db_service.find_similar_file_attachments(embedding)
+            # Wait for the question embedding and the similar file attachments
+            embedding, similar_files = await search_task
 
             # Combine thread files with similar files, prioritizing thread files
             all_file_attachments = thread_file_attachments.copy()
+            seen_ids = {tf.id for tf in thread_file_attachments if tf.id is not None}
             for file, _ in similar_files:
-                if not any(
-                    tf.id == file.id
-                    for tf in thread_file_attachments
-                    if tf.id is not None
-                ):
+                if file.id not in seen_ids:
                     all_file_attachments.append(file)
+                    seen_ids.add(file.id)
 
             # Always use the EMQX Q&A service to answer questions
             logger.info("Using EMQX Q&A service to answer question")
             response = await emqx_assistant_service.process_input(
-                question=question, file_attachments=all_file_attachments
+                question=question,
+                file_attachments=all_file_attachments,
+                question_embedding=embedding,
             )
 
             # Format the response
-            answer_text = response.answer
+            parts = [response.answer]
 
             # Add source references
             if response.sources:
-                source_links = []
-                for i, source in enumerate(response.sources, 1):
-                    source_link = f"<slack://channel?team={config.slack_team_id}&id={source.channel_id}&message={source.thread_ts}|Source {i}>"
-                    source_links.append(source_link)
-
-                answer_text += "\n\n*Sources:* " + ", ".join(source_links)
+                source_links = [
+                    f"{self._link_prefix}{source.channel_id}&message={source.thread_ts}|Source {i}>"
+                    for i, source in enumerate(response.sources, 1)
+                ]
+                parts.append("\n\n*Sources:* " + ", ".join(source_links))
 
             # Add file references
             if response.file_sources:
-                file_links = []
-                for i, file in enumerate(response.file_sources, 1):
-                    file_link = f"<slack://channel?team={config.slack_team_id}&id={file.channel_id}&message={file.thread_ts}|{file.file_name}>"
-                    file_links.append(file_link)
-
-                answer_text += "\n\n*File References:* " + ", ".join(file_links)
+                file_links = [
+                    f"{self._link_prefix}{file.channel_id}&message={file.thread_ts}|{file.file_name}>"
+                    for file in response.file_sources
+                ]
+                parts.append("\n\n*File References:* " + ", ".join(file_links))
 
             # Add note about thread files if they were processed
             if thread_file_attachments:
-                thread_file_names = [
-                    f"`{file.file_name}`" for file in thread_file_attachments
-                ]
-                answer_text += (
-                    f"\n\n*Files in this thread:* {', '.join(thread_file_names)}"
+                parts.append(
+                    "\n\n*Files in this thread:* "
+                    + ", ".join(
+                        f"`{file.file_name}`" for file in thread_file_attachments
+                    )
                 )
 
-            say(
+            answer_text = "".join(parts)
+
+            await say(
                 text=answer_text,
                 thread_ts=thread_ts,
             )
 
         except Exception as e:
             logger.error(f"Error answering question: {e}")
-            say(
+            await say(
                 text="I encountered an error while trying to answer your question.",
                 thread_ts=thread_ts,
             )
 
+    async def _search_similar_files(self, question: str):
+        """Find file attachments similar to a question.
+
+        Args:
+            question: The question text.
+
+        Returns:
+            A tuple of the question embedding and a list of tuples containing
+            the file attachment and its similarity score.
+        """
+        embedding = await self._run_blocking(embedding_cache.get_or_compute, question)
+        similar_files = await self._run_blocking(
+            db_service.find_similar_file_attachments, embedding
+        )
+        return embedding, similar_files
+
     def _is_analyze_thread_request(self, message: str) -> bool:
         """Check if the message is a request to analyze the current thread.
 
@@ -530,24 +758,20 @@ class SlackService:
         Returns:
             True if the message is a request to analyze the thread, False otherwise.
         """
-        analyze_patterns = [
-            r"help here",
-            r"analyze( this)? thread",
-            r"summarize( this)? thread",
-            r"assist( with)? this( thread)?",
-            r"help( with)? this( thread)?",
-            r"what('s| is) (happening|going on)( here)?",
-            r"can you (help|assist)( me)?( with this)?",
-            r"check this( thread)?( out)?",
-        ]
-
-        for pattern in analyze_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                return True
-
-        return False
-
-    async def _analyze_thread(self, channel_id: str, thread_ts: str, user_id: str, say):
+        lowered = message.lower()
+        if not any(hint in lowered for hint in _ANALYZE_HINTS):
+            return False
+
+        return bool(_ANALYZE_RE.search(message))
+
+    async def _analyze_thread(
+        self,
+        channel_id: str,
+        thread_ts: str,
+        user_id: str,
+        say,
+        event: Optional[dict] = None,
+    ):
         """Analyze the current thread and provide assistance.
 
         Args:
@@ -555,32 +779,45 @@ class SlackService:
             thread_ts: The thread timestamp.
             user_id: The user ID who requested the analysis.
             say: Function to send a message to the channel.
+            event: The message event requesting the analysis.
         """
+        ack_ts = None
         try:
             # Get all messages in the thread
-            response = self.client.conversations_replies(
-                channel=channel_id,
-                ts=thread_ts,
-            )
+            messages = await self._get_thread_messages(channel_id, thread_ts, event=event)
 
-            if not response["ok"] or not response["messages"]:
-                say(
+            if not messages:
+                await say(
                     text="I couldn't find any messages in this thread to analyze.",
                     thread_ts=thread_ts,
                 )
                 return
 
-            # Combine all messages into a single text
-            messages = response["messages"]
-            thread_content = "\n\n".join(
-                [
-                    f"<@{msg.get('user', 'UNKNOWN')}>: {msg.get('text', '')}"
-                    for msg in messages
-                ]
+            # Let the user know right away; the analysis can take a while
+            ack_ts = await self._acknowledge("Analyzing this thread...", thread_ts, say)
+
+            # Combine the messages into a single text, keeping the opening message
+            # and the most recent replies of very long threads
+            if len(messages) > _ANALYZE_MAX_MESSAGES:
+                recent = messages[-(_ANALYZE_MAX_MESSAGES - 1) :]
+                thread_content = self._format_thread_content([messages[0], *recent])
+            else:
+                thread_content = self._format_thread_content(messages)
+
+            # Look up the files already saved for this thread once
+            existing_attachments = (
+                await self._run_blocking(
+                    db_service.get_file_attachments_by_thread, channel_id, thread_ts
+                )
+                if any("files" in message for message in messages)
+                else []
             )
+            # Index by name, keeping the first match for duplicate names
+            existing_by_name = {a.file_name: a for a in reversed(existing_attachments)}
 
             # Process any files in the thread
             file_attachments = []
+            pending = []
             for message in messages:
                 if "files" in message:
                     for file in message["files"]:
@@ -590,19 +827,7 @@ class SlackService:
                         logger.info(f"Processing file in thread analysis: {file_name}")
 
                         # First check if the file is already in the database
-                        existing_attachments = (
-                            db_service.get_file_attachments_by_thread(
-                                channel_id, thread_ts
-                            )
-                        )
-                        existing_file = next(
-                            (
-                                a
-                                for a in existing_attachments
-                                if a.file_name == file_name
-                            ),
-                            None,
-                        )
+                        existing_file = existing_by_name.get(file_name)
 
                         if existing_file:
                             logger.info(
@@ -611,19 +836,23 @@ class SlackService:
                             file_attachments.append(existing_file)
                         else:
                             # Process and save the file attachment
-                            attachment = file_service.process_file(
-                                file_url=file_url,
-                                file_name=file_name,
-                                channel_id=channel_id,
-                                thread_ts=thread_ts,
-                                user_id=message.get("user", user_id),
+                            pending.append(
+                                self._run_blocking(
+                                    file_service.process_file,
+                                    file_url=file_url,
+                                    file_name=file_name,
+                                    channel_id=channel_id,
+                                    thread_ts=thread_ts,
+                                    user_id=message.get("user", user_id),
+                                )
                             )
 
-                            if attachment:
-                                logger.info(
-                                    f"File attachment processed for analysis: {attachment.id}"
-                                )
-                                file_attachments.append(attachment)
+            for attachment in await asyncio.gather(*pending):
+                if attachment:
+                    logger.info(
+                        f"File attachment processed for analysis: {attachment.id}"
+                    )
+                    file_attachments.append(attachment)
 
             # Create a question that asks for analysis of the thread and includes the thread content
             analysis_question = f"""Please analyze this conversation thread and provide assistance:
@@ -633,22 +862,15 @@ Thread Content:
 
 Provide a thorough analysis of the above conversation. Identify any problems, questions, or issues being discussed and provide helpful information, solutions, or recommendations. Focus on EMQX-related issues if present."""
 
-            # Create embedding for the thread content
-            embedding = emqx_assistant_service.create_embedding(thread_content)
-
-            # Create a thread context entry to provide to the Q&A service
+            # Create a thread context entry to provide to the Q&A service. It is
+            # passed in memory, so it needs no embedding and is never stored.
             current_thread_entry = KnowledgeEntry(
                 channel_id=channel_id,
                 thread_ts=thread_ts,
                 user_id=user_id,
                 content=thread_content,
-                embedding=embedding,
             )
 
-            # Save the thread entry temporarily to make it available as a source
-            temp_entry_id = db_service.save_knowledge(current_thread_entry)
-            logger.info(f"Temporary thread entry saved with ID: {temp_entry_id}")
-
             # Use the EMQX Q&A service for thread analysis
             logger.info("Using EMQX Q&A service for thread analysis")
 
@@ -659,35 +881,51 @@ Provide a thorough analysis of the above conversation. Identify any problems, qu
                 question=analysis_question,
                 session_id=session_id,
                 file_attachments=file_attachments,
+                extra_context=[current_thread_entry],
             )
 
-            # Remove the temporary entry to keep the database clean
-            db_service.delete_knowledge(temp_entry_id)
-
             # Format the response
-            answer_text = f"*Thread Analysis:*\n\n{response.answer}"
+            parts = ["*Thread Analysis:*\n\n", response.answer]
 
             # Add file references if any were processed
             if file_attachments:
-                file_names = [f"`{file.file_name}`" for file in file_attachments]
-                answer_text += f"\n\n*Files Analyzed:* {', '.join(file_names)}"
+                parts.append(
+                    "\n\n*Files Analyzed:* "
+                    + ", ".join(f"`{file.file_name}`" for file in file_attachments)
+                )
 
-            say(
-                text=answer_text,
-                thread_ts=thread_ts,
-            )
+            answer_text = "".join(parts)
+
+            await self._reply(answer_text, channel_id, thread_ts, say, ack_ts)
 
         except Exception as e:
             logger.error(f"Error analyzing thread: {e}")
-            say(
-                text="I encountered an error while trying to analyze this thread.",
-                thread_ts=thread_ts,
+            await self._reply(
+                "I encountered an error while trying to analyze this thread.",
+                channel_id,
+                thread_ts,
+                say,
+                ack_ts,
             )
 
     def start(self):
-        """Start the Slack bot."""
-        handler = SocketModeHandler(self.app, config.slack_app_token)
-        handler.start()
+        """Start the Slack bot and block until it stops."""
+        asyncio.run(self.start_async())
+
+    async def start_async(self):
+        """Start the Slack bot on the running event loop.
+
+        Runs until cancelled, then closes the socket mode connection and
+        waits for blocking work already running in worker threads.
+        """
+        handler = AsyncSocketModeHandler(self.app, config.slack_app_token)
+        try:
+            await handler.start_async()
+        finally:
+            await handler.close_async()
+            # Queued work is dropped; running work may still be using the
+            # database, which is closed once this returns
+            await asyncio.to_thread(self._executor.shutdown, cancel_futures=True)
 
 
 # Create a global Slack service instance
@@ -1,17 +1,36 @@
 import logging
-import json
-import urllib.request
+import time
+import jwt
+import orjson
 import requests
-from functools import cache
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Shared session so EMQX API calls reuse TCP/TLS connections across requests
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# Login tokens keyed by (endpoint, username), stored with their expiry time
+_token_cache = {}
+
+# Token lifetime when the token carries no expiry, and how long before expiry
+# a cached token is considered stale
+_DEFAULT_TOKEN_TTL = 3600
+_TOKEN_EXPIRY_MARGIN = 60
+
 
 class EmqxToolWrapper:
     def __init__(self, endpoint, username, password):
-        self.endpoint = endpoint
+        # Normalize the endpoint once and build the API URLs up front
+        self.endpoint = endpoint.rstrip("/")
         self.username = username
         self.password = password
+        self._nodes_url = f"{self.endpoint}/api/v5/nodes"
+        self._connectors_url = f"{self.endpoint}/api/v5/connectors"
+        self._auth_url = f"{self.endpoint}/api/v5/authentication"
 
     def get_cluster_info(self) -> str:
         """
@@ -28,7 +47,7 @@ class EmqxToolWrapper:
         """
         return make_emqx_api_request(
             base_url=self.endpoint,
-            api="/api/v5/nodes",
+            url=self._nodes_url,
             username=self.username,
             password=self.password,
         )
@@ -52,7 +71,7 @@ class EmqxToolWrapper:
         """
         return make_emqx_api_request(
             base_url=self.endpoint,
-            api="/api/v5/connectors",
+            url=self._connectors_url,
             username=self.username,
             password=self.password,
         )
@@ -72,16 +91,45 @@ class EmqxToolWrapper:
         """
         return make_emqx_api_request(
             base_url=self.endpoint,
-            api="/api/v5/authentication",
+            url=self._auth_url,
             username=self.username,
             password=self.password,
         )
 
 
-@cache
+def _token_expiry(token: str) -> float:
+    """Get the time after which a token should no longer be used.
+
+    Args:
+        token: The token returned by the EMQX login API
+
+    Returns:
+        float: Expiry time as a Unix timestamp
+    """
+    try:
+        # EMQX tokens are JWTs; only the exp claim is needed, not verification
+        claims = jwt.decode(token, options={"verify_signature": False})
+        expires_at = float(claims["exp"])
+    except Exception:
+        expires_at = time.time() + _DEFAULT_TOKEN_TTL
+    return expires_at - _TOKEN_EXPIRY_MARGIN
+
+
+def invalidate_emqx_token(endpoint: str, username: str):
+    """Drop the cached token for an endpoint and user.
+
+    Args:
+        endpoint: The EMQX API endpoint
+        username: EMQX API username
+    """
+    _token_cache.pop((endpoint.rstrip("/"), username), None)
+
+
 def emqx_login(endpoint: str, username: str, password: str) -> str:
     """Obtain an authentication token from the EMQX broker.
 
+    Tokens are cached until shortly before they expire.
+
     Args:
         endpoint: The EMQX API endpoint
         username: EMQX API username
@@ -94,6 +142,11 @@ def emqx_login(endpoint: str, username: str, password: str) -> str:
     if endpoint.endswith("/"):
         endpoint = endpoint[:-1]
 
+    # Reuse a cached token while it is still valid
+    cached = _token_cache.get((endpoint, username))
+    if cached and cached[1] > time.time():
+        return cached[0]
+
     try:
         # Set a timeout for the request (5 seconds)
         login_url = f"{endpoint}/api/v5/login"
@@ -101,15 +154,16 @@ def emqx_login(endpoint: str, username: str, password: str) -> str:
         payload = {"username": username, "password": password}
 
         # Request the token
-        response = requests.post(
-            login_url, headers=headers, data=json.dumps(payload), timeout=5
+        response = _SESSION.post(
+            login_url, headers=headers, data=orjson.dumps(payload), timeout=5
         )
 
         if response.status_code == 200:
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             token = token_data.get("token", "")
             if token:
                 logger.info("Successfully obtained EMQX API token")
+                _token_cache[(endpoint, username)] = (token, _token_expiry(token))
                 return token
             else:
                 logger.error("Token not found in response")
@@ -125,13 +179,41 @@ def emqx_login(endpoint: str, username: str, password: str) -> str:
         return ""
 
 
+def _request_headers(base_url: str, username: str, password: str) -> dict:
+    """Build the headers for an EMQX API request.
+
+    Args:
+        base_url: The base URL of the EMQX broker.
+        username: Username for basic auth
+        password: Password for basic auth
+
+    Returns:
+        dict: The request headers, including the bearer token if available
+    """
+    headers = {"Content-Type": "application/json"}
+
+    # Add auth header if credentials provided
+    if username and password:
+        # Get a token using username/password from cache or login
+        token = emqx_login(base_url, username, password)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        else:
+            logging.warning("Failed to get token, request will likely fail")
+    else:
+        logging.warning("No authentication provided for EMQX API request")
+
+    return headers
+
+
 def make_emqx_api_request(
     base_url: str,
-    api: str,
+    api: str = None,
     username: str = None,
     password: str = None,
     method: str = "GET",
     data: str = None,
+    url: str = None,
 ) -> str:
     """Make an API request to the EMQX broker.
 
@@ -142,42 +224,48 @@ def make_emqx_api_request(
         password: Password for basic auth
         method: The HTTP method to use (GET, POST, etc.)
         data: Optional data to send with the request
+        url: The complete URL to call, used instead of base_url and api
 
     Returns:
         The JSON response from the EMQX API
     """
 
-    # Create the complete URL
-    url = f"{base_url}{api}"
+    # Create the complete URL unless one was given
+    if url is None:
+        url = f"{base_url}{api}"
 
     logger.info(f"make_emqx_api_request({url})")
 
-    # Create the request
-    headers = {"Content-Type": "application/json"}
-    req = urllib.request.Request(url, method=method, headers=headers)
-
-    # Add auth header if credentials provided
-    if username and password:
-        # Get a token using username/password from cache or login
-        token = emqx_login(base_url, username, password)
-        if token:
-            req.add_header("Authorization", f"Bearer {token}")
-        else:
-            logging.warning("Failed to get token, request will likely fail")
-    else:
-        logging.warning("No authentication provided for EMQX API request")
-
     # Add data if provided
-    if data and method != "GET":
-        req.data = json.dumps(data).encode("utf-8")
+    body = orjson.dumps(data) if data and method != "GET" else None
 
     try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode("utf-8"))
-    except urllib.error.URLError as e:
+        response = _SESSION.request(
+            method,
+            url,
+            headers=_request_headers(base_url, username, password),
+            data=body,
+            timeout=5,
+        )
+
+        # A rejected token may have been rotated; log in again and retry once
+        if response.status_code == 401 and username and password:
+            logger.info("EMQX API token rejected, logging in again")
+            invalidate_emqx_token(base_url, username)
+            response = _SESSION.request(
+                method,
+                url,
+                headers=_request_headers(base_url, username, password),
+                data=body,
+                timeout=5,
+            )
+
+        response.raise_for_status()
+        # Parse straight from the response bytes
+        return orjson.loads(response.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         error_msg = f"EMQX API request {method} {url} failed: {str(e)}"
         logging.error(error_msg)
-        if hasattr(e, "read"):
-            error_response = e.read().decode("utf-8")
-            logging.error(f"Error response: {error_response}")
+        if getattr(e, "response", None) is not None:
+            logging.error(f"Error response: {e.response.text}")
         raise Exception(error_msg)
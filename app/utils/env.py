@@ -0,0 +1,20 @@
+"""Environment variable access shared by the scripts."""
+
+import functools
+import os
+from typing import Dict, Optional
+
+from dotenv import dotenv_values
+
+
+@functools.cache
+def get_env() -> Dict[str, Optional[str]]:
+    """Get the environment, with values from the .env file parsed only once.
+
+    Variables already set in the process environment take precedence over
+    the .env file, as with load_dotenv().
+
+    Returns:
+        dict: Environment variable names mapped to their values
+    """
+    return {**dotenv_values(), **os.environ}
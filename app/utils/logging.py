@@ -1,11 +1,33 @@
 """Logging configuration for the application."""
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 from app.config import config
 
+# Console handler installed by configure_logging, once set up
+_console_handler: Optional[logging.Handler] = None
+
+# Thread writing queued log records to the console handler
+_listener: Optional[QueueListener] = None
+
+
+class LocalQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    QueueHandler.prepare() formats each record on the logging thread so it
+    can be pickled; the queue here never leaves the process, so records are
+    passed on as they are.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return the record unchanged for the listener's handler to format."""
+        return record
+
 
 def configure_logging(level: Optional[str] = None) -> None:
     """Configure logging for the application.
@@ -25,6 +47,12 @@ def configure_logging(level: Optional[str] = None) -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
 
+    # Handlers are only set up once; later calls just change the level
+    global _console_handler, _listener
+    if _console_handler is not None:
+        _console_handler.setLevel(numeric_level)
+        return
+
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
@@ -40,8 +68,14 @@ def configure_logging(level: Optional[str] = None) -> None:
     )
     console_handler.setFormatter(formatter)
 
-    # Add handler to root logger
-    root_logger.addHandler(console_handler)
+    # Loggers only enqueue records; formatting and console writes happen on
+    # the listener thread, off the event loop
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(LocalQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    _console_handler = console_handler
 
     # Log configuration
     logging.debug(f"Logging configured with level: {level}")
@@ -1,3 +1,6 @@
+from typing import Dict, List
+
+
 def get_ping_response_time(host: str, count: int = 5) -> float:
     """
     Ping tool: Get average ping response time from a remote host using ICMP protocol.
@@ -11,14 +14,20 @@ def get_ping_response_time(host: str, count: int = 5) -> float:
     """
     print(f"ping {host} to get the response time.")
     try:
+        from concurrent.futures import ThreadPoolExecutor
+
         from ping3 import ping
 
+        # Send the probes concurrently so the wait is about one RTT, not count;
+        # ping3 tags each probe with its thread's ID, so replies don't mix
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            results = list(executor.map(lambda _: ping(host, timeout=2), range(count)))
+
         total_time = 0
         successful_pings = 0
 
-        for _ in range(count):
-            response_time = ping(host, timeout=2)
-            if response_time is not None:
+        for response_time in results:
+            if response_time is not None and response_time is not False:
                 total_time += response_time
                 successful_pings += 1
 
@@ -46,12 +55,39 @@ def check_port_available(host: str, port: int, timeout: float = 2.0) -> bool:
     """
     print(f"check_port_available for {host}.")
     import socket
+    from contextlib import closing
 
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        result = sock.connect_ex((host, port))
-        sock.close()
-        return result == 0
+        with closing(socket.create_connection((host, port), timeout=timeout)):
+            return True
     except (socket.gaierror, socket.error, Exception):
         return False
+
+
+def check_ports_available(addresses: List[str], timeout: float = 2.0) -> Dict[str, bool]:
+    """
+    Telnet tool: Check several remote host:port addresses at once.
+
+    Args:
+        addresses (List[str]): Addresses to check, each as "host:port", e.g. "10.0.0.1:1883"
+        timeout (float): Connection timeout in seconds for each check (default: 2.0)
+
+    Returns:
+        Dict[str, bool]: Whether each address is available; malformed addresses are False
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def check(address: str) -> bool:
+        host, _, port = address.strip().rpartition(":")
+        # Accept bracketed IPv6 hosts, e.g. "[::1]:1883"
+        host = host.strip("[]")
+        if not host or not port.isdigit():
+            return False
+        return check_port_available(host, int(port), timeout)
+
+    if not addresses:
+        return {}
+
+    # Check all addresses concurrently, so the wait is the slowest check, not the sum
+    with ThreadPoolExecutor(max_workers=min(32, len(addresses))) as executor:
+        return dict(zip(addresses, executor.map(check, addresses)))
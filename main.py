@@ -1,74 +1,236 @@
 """Main entry point for the application."""
 
+import argparse
+import asyncio
+import contextlib
 import logging
 import sys
 import signal
-import uvicorn
-import traceback
 import threading
-import asyncio
+import uvicorn
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 from app.config import config
 from app.utils.logging import configure_logging
-from app.api.app import app as api_app
-from app.services.database import db_service
 
-# Global variable to store the Slack thread
-slack_thread = None
+logger = logging.getLogger(__name__)
+
+# Import string for the API app, needed by uvicorn to start worker processes
+API_APP_PATH = "app.api.app:app"
+
 
+def server_options() -> dict:
+    """Get the uvicorn settings shared by the single and multi-process servers.
 
-def handle_exit(signum, frame):
-    """Handle exit signals."""
-    logger = logging.getLogger(__name__)
-    logger.info(f"Received signal {signum}, shutting down...")
-    # Close database connection pool
-    db_service.close()
-    sys.exit(0)
+    Returns:
+        dict: Keyword arguments for uvicorn.Config
+    """
+    return {
+        "host": config.host,
+        "port": config.port,
+        "log_level": config.log_level.lower(),
+        "access_log": config.access_log,
+        # Reuse idle HTTP connections longer, and answer 503 rather than
+        # accept more connections and tasks than a worker can hold
+        "timeout_keep_alive": config.keep_alive_timeout,
+        "limit_concurrency": config.limit_concurrency,
+        "backlog": config.backlog,
+        # C-accelerated HTTP parsing and WebSocket framing from uvicorn[standard]
+        "http": "httptools",
+        "ws": "websockets",
+        "ws_ping_interval": config.websocket_ping_interval,
+        "ws_ping_timeout": config.websocket_timeout,
+        "ws_max_size": config.websocket_max_message_size,
+    }
 
 
-def start_slack_service():
-    """Start the Slack service in a separate thread with its own event loop."""
-    if not config.enable_slack:
-        return
+class LoopSignalServer(uvicorn.Server):
+    """uvicorn server whose shutdown signals are handled by the event loop."""
 
-    logger = logging.getLogger(__name__)
+    @contextlib.contextmanager
+    def capture_signals(self):
+        """Leave signal handling to the handlers installed in serve()."""
+        yield
 
+
+async def run_slack_service():
+    """Run the Slack service on the current event loop until cancelled."""
     try:
         from app.services.slack_service import slack_service
 
-        # Create a function that sets up an event loop for the thread
-        def start_slack_with_loop():
-            # Create a new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            # Start the slack service
-            try:
-                logger.info("Starting Slack service...")
-                slack_service.start()
-            except Exception as e:
-                logger.error(f"Error in Slack service: {e}")
-                logger.error(traceback.format_exc())
-
-        # Start in a daemon thread so it gets killed when the main thread exits
-        global slack_thread
-        slack_thread = threading.Thread(target=start_slack_with_loop, daemon=True)
+        logger.info("Starting Slack service...")
+        await slack_service.start_async()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.exception(f"Error in Slack service: {e}")
+
+
+async def serve():
+    """Run the API server and, if enabled, the Slack service on one event loop."""
+    from app.api.app import app as api_app
+
+    loop_type = type(asyncio.get_running_loop())
+    logger.info(f"Event loop: {loop_type.__module__}.{loop_type.__name__}")
+
+    server_config = uvicorn.Config(api_app, **server_options())
+
+    # Start the Slack service alongside the server
+    slack_task = None
+    if config.enable_slack:
+        slack_task = asyncio.create_task(run_slack_service())
+
+    async def stop_slack():
+        """Cancel the Slack service and wait for its in-flight work."""
+        if slack_task is not None:
+            slack_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await slack_task
+
+    async def shutdown(sig):
+        """Stop the Slack service, then let the server drain and shut down."""
+        await stop_slack()
+        server.handle_exit(sig, None)
+
+    shutdown_task = None
+
+    def on_signal(sig):
+        """Start the graceful shutdown; repeated signals go to the server."""
+        nonlocal shutdown_task
+        if shutdown_task is None:
+            shutdown_task = asyncio.create_task(shutdown(sig))
+        else:
+            server.handle_exit(sig, None)
+
+    # Handle SIGINT/SIGTERM on the event loop, so the Slack service is done
+    # with the database before the server's lifespan closes it. Where the
+    # loop can't handle signals (Windows), uvicorn installs its own handlers.
+    server = LoopSignalServer(server_config)
+    loop = asyncio.get_running_loop()
+    try:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, on_signal, sig)
+    except NotImplementedError:
+        server = uvicorn.Server(server_config)
+
+    try:
+        await server.serve()
+    finally:
+        # Stop the Slack service if the server stopped by itself
+        await stop_slack()
+
+
+async def serve_slack():
+    """Run only the Slack service until SIGINT/SIGTERM."""
+    slack_task = asyncio.create_task(run_slack_service())
+
+    # Stop the service from the event loop; where the loop can't handle
+    # signals (Windows), Ctrl+C raises KeyboardInterrupt instead
+    loop = asyncio.get_running_loop()
+    with contextlib.suppress(NotImplementedError):
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, slack_task.cancel)
+
+    with contextlib.suppress(asyncio.CancelledError):
+        await slack_task
+
+
+class SlackThread(threading.Thread):
+    """Background thread running the Slack service on its own event loop."""
+
+    def __init__(self, run):
+        """Create the thread.
+
+        Args:
+            run: The function used to run the thread's event loop
+        """
+        super().__init__(name="slack-service", daemon=True)
+        self._run_loop = run
+        self._started = threading.Event()
+        self._loop = None
+        self._task = None
+
+    def run(self):
+        """Run the Slack service until it is stopped."""
+        try:
+            self._run_loop(self._serve())
+        finally:
+            # Don't leave stop() waiting if the loop failed to start
+            self._started.set()
+
+    async def _serve(self):
+        """Start the Slack service task and wait for it to finish."""
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(run_slack_service())
+        self._started.set()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+    def stop(self):
+        """Cancel the Slack service and wait for the thread to finish."""
+        self._started.wait()
+        if self._task is not None:
+            # The loop is already closed if the service stopped by itself
+            with contextlib.suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._task.cancel)
+        self.join()
+
+
+def serve_workers(run):
+    """Run the API server in worker processes and the Slack service in this one.
+
+    Args:
+        run: The function used to run the Slack service's event loop
+    """
+    # uvicorn supervises the workers from the main thread, so the Slack
+    # service gets its own event loop in a background thread
+    slack_thread = None
+    if config.enable_slack:
+        slack_thread = SlackThread(run)
         slack_thread.start()
-        logger.info("Slack service started in background thread with event loop")
 
-    except Exception as e:
-        logger.error(f"Failed to start Slack service: {e}")
-        logger.error(traceback.format_exc())
+    try:
+        # Each worker imports the app and opens its own database pool
+        uvicorn.run(API_APP_PATH, workers=config.workers, **server_options())
+    finally:
+        # Stop the Slack service before the caller closes the database pool
+        if slack_thread is not None:
+            slack_thread.stop()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Args:
+        argv: The arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="EMQX Knowledge Base")
+    parser.add_argument(
+        "--mode",
+        choices=("api", "slack", "both"),
+        default="both" if config.enable_slack else "api",
+        help="Services to run: the API server, the Slack service or both "
+        "(default: both if ENABLE_SLACK is true, otherwise api)",
+    )
+    return parser.parse_args(argv)
 
 
 def main():
     """Start the application."""
+    args = parse_args()
+
     # Configure logging
     configure_logging()
-    logger = logging.getLogger(__name__)
 
-    # Set up signal handlers
-    signal.signal(signal.SIGINT, handle_exit)
-    signal.signal(signal.SIGTERM, handle_exit)
+    # The mode decides whether the Slack service runs and needs credentials
+    config.enable_slack = args.mode != "api"
 
     # Validate configuration
     missing_config = config.validate_config()
@@ -87,10 +249,6 @@ def main():
         f"Slack integration: {'Enabled' if config.enable_slack else 'Disabled'}"
     )
 
-    # Start Slack service if enabled
-    if config.enable_slack:
-        start_slack_service()
-
     # Log WebSocket configuration at debug level
     logger.debug(f"WebSocket ping interval: {config.websocket_ping_interval} seconds")
     logger.debug(f"WebSocket timeout: {config.websocket_timeout} seconds")
@@ -98,25 +256,30 @@ def main():
         f"WebSocket max message size: {config.websocket_max_message_size} bytes"
     )
 
+    # Import the services only once the configuration is known to be valid
+    from app.services.database import db_service
+
     try:
-        # Start the API server directly in the main thread
-        logger.info(f"Starting API server on http://{config.host}:{config.port}")
-        uvicorn.run(
-            api_app,
-            host=config.host,
-            port=config.port,
-            log_level=config.log_level.lower(),
-            ws_ping_interval=config.websocket_ping_interval,
-            ws_ping_timeout=config.websocket_timeout,
-            ws_max_size=config.websocket_max_message_size,
-        )
+        # Prefer the libuv-based loop when it is installed
+        run = uvloop.run if uvloop is not None else asyncio.run
+        if args.mode == "slack":
+            run(serve_slack())
+        else:
+            logger.info(f"Starting API server on http://{config.host}:{config.port}")
+            if config.workers > 1:
+                logger.info(f"Starting {config.workers} API server workers")
+                serve_workers(run)
+            else:
+                # Start the API server and the Slack service on one event loop
+                run(serve())
 
+        logger.info("Shutting down gracefully...")
+        db_service.close()
     except KeyboardInterrupt:
         logger.info("Shutting down gracefully...")
         db_service.close()
     except Exception as e:
-        logger.error(f"Error starting the application: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error starting the application: {e}")
         db_service.close()
         sys.exit(1)
 
@@ -8,43 +8,66 @@ JWT token that can be used for testing protected endpoints in production mode.
 
 import sys
 import os
-import jwt
 import time
 import uuid
-from datetime import datetime, timedelta, timezone
-from dotenv import load_dotenv
+from datetime import datetime, timezone
+import jwt
+from jwt.algorithms import get_default_algorithms
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# Load environment variables from .env file
-load_dotenv()
+from app.utils.env import get_env
 
-# Get JWT secret from environment
-jwt_secret = os.getenv("JWT_SECRET")
-if not jwt_secret:
+# Read the environment and .env file once and snapshot the settings
+env = get_env()
+JWT_SECRET = env.get("JWT_SECRET")
+TOKEN_EXPIRATION_HOURS = int(env.get("TOKEN_EXPIRATION_HOURS") or "24")
+
+# Check the JWT secret is configured
+if not JWT_SECRET:
     print("ERROR: JWT_SECRET not found in .env file")
     print("Please set JWT_SECRET in your .env file")
     sys.exit(1)
 
-# Set token expiration (default: 24 hours)
-expiration_hours = int(os.getenv("TOKEN_EXPIRATION_HOURS", "24"))
-expiration = datetime.now(timezone.utc) + timedelta(hours=expiration_hours)
+# Prepare the HS256 key once for every token generated
+SIGNING_KEY = get_default_algorithms()["HS256"].prepare_key(JWT_SECRET)
+
+
+def make_token(payload: dict) -> str:
+    """Sign a payload as an HS256 JWT with the prepared key.
+
+    Args:
+        payload: The token claims
+
+    Returns:
+        str: The encoded token
+    """
+    return jwt.encode(payload, SIGNING_KEY, algorithm="HS256")
+
+
+# Set token issue and expiration times (default: 24 hours)
+issued_at = int(time.time())
+expires_at = issued_at + TOKEN_EXPIRATION_HOURS * 3600
 
 # Create payload
 payload = {
     "sub": f"user-{uuid.uuid4()}",  # Subject (user ID)
     "name": "Test User",  # Name for display
     "email": "test@example.com",  # Email for display
-    "iat": int(time.time()),  # Issued at
-    "exp": int(expiration.timestamp()),  # Expiration time
+    "iat": issued_at,  # Issued at
+    "exp": expires_at,  # Expiration time
 }
 
 # Generate token
-token = jwt.encode(payload, jwt_secret, algorithm="HS256")
+token = make_token(payload)
 
 # Print token
 print("\n=== JWT Token for Testing ===")
 print(f"\nToken: {token}\n")
+expiration = datetime.fromtimestamp(expires_at, timezone.utc)
 print(f"Expires: {expiration.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-print(f"Valid for: {expiration_hours} hours")
+print(f"Valid for: {TOKEN_EXPIRATION_HOURS} hours")
 print("\nFor WebSocket testing, add this token as a query parameter:")
 print(f"ws://localhost:8000/ws/analyze-log?token={token}")
 print("\nFor API testing, add this as a header:")
@@ -4,9 +4,9 @@
 import logging
 import os
 import sys
+from contextlib import nullcontext
 
 import psycopg
-from dotenv import load_dotenv
 
 # Add the parent directory to the path so we can import from app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -21,8 +21,7 @@ logger = logging.getLogger(__name__)
 
 def init_db():
     """Initialize the database with the pg_vector extension."""
-    # Load environment variables
-    load_dotenv()
+    # Environment variables and the .env file were read by app.config
 
     # Check if DATABASE_URL is set
     if not config.database_url:
@@ -30,10 +29,15 @@ def init_db():
         sys.exit(1)
 
     try:
-        # Connect to the database
+        # Connect to the database; autocommit applies each statement as it
+        # runs, without a separate COMMIT round trip
         logger.info(f"Connecting to database: {config.database_url}")
-        with psycopg.connect(config.database_url) as conn:
-            with conn.cursor() as cur:
+        with psycopg.connect(config.database_url, autocommit=True) as conn:
+            # Pipeline mode sends both statements before waiting for results,
+            # so creating and checking the extension takes one round trip.
+            # It needs libpq 14+; older clients run the statements one by one.
+            pipeline = conn.pipeline() if psycopg.Pipeline.is_supported() else nullcontext()
+            with pipeline, conn.cursor() as cur:
                 # Create the vector extension
                 logger.info("Creating pg_vector extension...")
                 cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
@@ -51,9 +55,6 @@ def init_db():
                     logger.error("Failed to install pg_vector extension.")
                     sys.exit(1)
 
-                # Commit the changes
-                conn.commit()
-
         logger.info("Database initialization completed successfully.")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
@@ -1,8 +1,71 @@
 """Configuration file for pytest."""
 
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
+
 # Add the project root directory to the Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+
+class FakeCursor:
+    """Database cursor returning preset rows and recording executed queries."""
+
+    def __init__(self, fetchone=None, fetchall=()):
+        self.fetchone_result = fetchone
+        self.fetchall_result = list(fetchall)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchone(self):
+        return self.fetchone_result
+
+    def fetchall(self):
+        return self.fetchall_result
+
+
+class FakeConnection:
+    """Database connection handing out a single fake cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self, row_factory=None):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakePool:
+    """Connection pool handing out a single fake connection."""
+
+    def __init__(self, fetchone=None, fetchall=()):
+        self.cursor = FakeCursor(fetchone, fetchall)
+        self.conn = FakeConnection(self.cursor)
+        self.closed = False
+
+    @contextmanager
+    def connection(self):
+        yield self.conn
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_pool():
+    """Provide a fake connection pool; set rows on fake_pool.cursor."""
+    return FakePool()
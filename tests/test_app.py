@@ -0,0 +1,10 @@
+"""Tests for the FastAPI application setup."""
+
+from app.api.app import ORJSONResponse
+
+
+def test_orjson_response_accepts_non_string_keys():
+    """Test that dicts with non-string keys serialize as they did with json.dumps."""
+    response = ORJSONResponse({1: "node", "status": "running"})
+
+    assert response.body == b'{"1":"node","status":"running"}'
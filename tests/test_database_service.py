@@ -1,32 +1,27 @@
 """Tests for the database service."""
 
-import os
 from unittest.mock import MagicMock
 
 import pytest
-from psycopg_pool import ConnectionPool
 
 from app.models.knowledge import KnowledgeEntry
 from app.services.database import DatabaseService
 
 
-@pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="DATABASE_URL not set")
+@pytest.fixture
+def service(fake_pool):
+    """Create a service using the fake connection pool."""
+    service = DatabaseService()
+    service.pool = fake_pool
+    return service
+
+
 class TestDatabaseService:
     """Tests for the database service."""
 
-    def test_save_knowledge(self, monkeypatch):
+    def test_save_knowledge(self, service, fake_pool):
         """Test saving a knowledge entry."""
-        # Mock the connection pool
-        mock_pool = MagicMock(spec=ConnectionPool)
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = [1]  # Return ID 1
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_pool.connection.return_value.__enter__.return_value = mock_conn
-
-        # Create the service with the mock pool
-        service = DatabaseService()
-        service.pool = mock_pool
+        fake_pool.cursor.fetchone_result = [1]  # Return ID 1
 
         # Create test data
         entry = KnowledgeEntry(
@@ -42,16 +37,12 @@ class TestDatabaseService:
 
         # Check the result
         assert entry_id == 1
-        mock_cursor.execute.assert_called_once()
-        mock_conn.commit.assert_called_once()
+        assert len(fake_pool.cursor.executed) == 1
+        assert fake_pool.conn.commits == 1
 
-    def test_find_similar_entries(self, monkeypatch):
+    def test_find_similar_entries(self, service, fake_pool):
         """Test finding similar entries."""
-        # Mock the connection pool
-        mock_pool = MagicMock(spec=ConnectionPool)
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = [
+        fake_pool.cursor.fetchall_result = [
             {
                 "id": 1,
                 "channel_id": "C123",
@@ -63,12 +54,6 @@ class TestDatabaseService:
                 "similarity": 0.9,
             }
         ]
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_pool.connection.return_value.__enter__.return_value = mock_conn
-
-        # Create the service with the mock pool
-        service = DatabaseService()
-        service.pool = mock_pool
 
         # Call the method
         results = service.find_similar_entries([0.1, 0.2, 0.3])
@@ -79,15 +64,11 @@ class TestDatabaseService:
         assert entry.id == 1
         assert entry.channel_id == "C123"
         assert similarity == 0.9
-        mock_cursor.execute.assert_called_once()
+        assert len(fake_pool.cursor.executed) == 1
 
-    def test_get_entry_by_thread(self, monkeypatch):
+    def test_get_entry_by_thread(self, service, fake_pool):
         """Test getting an entry by thread."""
-        # Mock the connection pool
-        mock_pool = MagicMock(spec=ConnectionPool)
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = {
+        fake_pool.cursor.fetchone_result = {
             "id": 1,
             "channel_id": "C123",
             "thread_ts": "1234.5678",
@@ -96,12 +77,6 @@ class TestDatabaseService:
             "created_at": "2023-01-01T00:00:00Z",
             "updated_at": "2023-01-01T00:00:00Z",
         }
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_pool.connection.return_value.__enter__.return_value = mock_conn
-
-        # Create the service with the mock pool
-        service = DatabaseService()
-        service.pool = mock_pool
 
         # Call the method
         entry = service.get_entry_by_thread("C123", "1234.5678")
@@ -111,4 +86,34 @@ class TestDatabaseService:
         assert entry.id == 1
         assert entry.channel_id == "C123"
         assert entry.thread_ts == "1234.5678"
-        mock_cursor.execute.assert_called_once()
+        assert len(fake_pool.cursor.executed) == 1
+
+    def test_get_cached_embedding(self, service, fake_pool):
+        """Test getting a cached embedding."""
+        fake_pool.cursor.fetchone_result = [[0.1, 0.2, 0.3]]
+
+        # Call the method
+        embedding = service.get_cached_embedding(b"key")
+
+        # Check the result
+        assert embedding == [0.1, 0.2, 0.3]
+        assert len(fake_pool.cursor.executed) == 1
+
+    def test_pool_is_created_lazily(self, monkeypatch):
+        """Test that the connection pool is only created on first use."""
+        # Mock the connection pool class
+        mock_pool_class = MagicMock()
+        monkeypatch.setattr("app.services.database.ConnectionPool", mock_pool_class)
+
+        # Creating the service doesn't connect
+        service = DatabaseService()
+        mock_pool_class.assert_not_called()
+
+        # Closing an unused service is a no-op
+        service.close()
+        mock_pool_class.assert_not_called()
+
+        # The first access creates the pool and the schema
+        pool = service.pool
+        assert service.pool is pool
+        mock_pool_class.assert_called_once()
@@ -0,0 +1,142 @@
+"""Tests for the embedding batcher and cache."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.embedding_cache import CachedEmbedder, EmbeddingBatcher
+
+
+class FakeEmbedder:
+    """Embedder recording the batches it is asked to embed."""
+
+    def __init__(self, vector=None, error=None, gate=None):
+        self.vector = vector
+        self.error = error
+        self.gate = gate
+        self.batches = []
+
+    def create_embeddings_batch(self, texts):
+        self.batches.append(list(texts))
+        if self.gate is not None:
+            self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return [self.vector or [float(len(text)), 1.0] for text in texts]
+
+
+class FakeDB:
+    """Persistent embedding cache kept in a dict."""
+
+    def __init__(self):
+        self.embeddings = {}
+
+    def get_cached_embedding(self, key):
+        return self.embeddings.get(key)
+
+    def save_cached_embedding(self, key, embedding):
+        self.embeddings[key] = embedding
+
+
+def test_batcher_resolves_futures_in_batches():
+    """Test that queued texts share requests and each gets its own vector."""
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_batch=2, max_wait=0.5)
+
+    futures = [batcher.submit(text) for text in ["a", "bb", "ccc"]]
+
+    assert [future.result(timeout=5) for future in futures] == [
+        [1.0, 1.0],
+        [2.0, 1.0],
+        [3.0, 1.0],
+    ]
+    assert embedder.batches == [["a", "bb"], ["ccc"]]
+
+
+def test_batcher_propagates_errors_and_keeps_running():
+    """Test that a failed request fails its futures without stopping the worker."""
+    embedder = FakeEmbedder(error=ValueError("API unavailable"))
+    batcher = EmbeddingBatcher(embedder, max_wait=0)
+
+    with pytest.raises(ValueError):
+        batcher.submit("a").result(timeout=5)
+
+    embedder.error = None
+    assert batcher.submit("a").result(timeout=5) == [1.0, 1.0]
+
+
+def test_concurrent_misses_share_a_request():
+    """Test that cache misses from several threads are embedded together."""
+    embedder = FakeEmbedder()
+    cache = CachedEmbedder(embedder, FakeDB())
+    cache.batcher.max_wait = 0.5
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(cache.get_or_compute, ["a", "bb", "ccc"]))
+
+    assert results == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+    assert len(embedder.batches) == 1
+
+
+def test_cache_tiers():
+    """Test that repeated texts come from memory, then from the database."""
+    embedder = FakeEmbedder()
+    db = FakeDB()
+    cache = CachedEmbedder(embedder, db)
+
+    embedding = cache.get_or_compute("question")
+    assert cache.get_or_compute("question") == embedding
+    assert len(embedder.batches) == 1
+    assert list(db.embeddings.values()) == [embedding]
+
+    # A new process starts with an empty memory tier but the same database
+    assert CachedEmbedder(embedder, db).get_or_compute("question") == embedding
+    assert len(embedder.batches) == 1
+
+
+def test_lru_eviction():
+    """Test that the least recently used embedding leaves the memory tier."""
+    cache = CachedEmbedder(FakeEmbedder(), FakeDB(), maxsize=2)
+
+    cache.get_or_compute("a")
+    cache.get_or_compute("b")
+    cache.get_or_compute("a")
+    cache.get_or_compute("c")
+
+    assert list(cache._memory) == [cache._key("a"), cache._key("c")]
+
+
+def test_zero_vector_is_not_cached():
+    """Test that the fallback vector from a failed API call isn't stored."""
+    embedder = FakeEmbedder(vector=[0.0, 0.0])
+    db = FakeDB()
+    cache = CachedEmbedder(embedder, db)
+
+    assert cache.get_or_compute("question") == [0.0, 0.0]
+    assert cache.get_or_compute("question") == [0.0, 0.0]
+
+    assert len(embedder.batches) == 2
+    assert db.embeddings == {}
+    assert not cache._memory
+
+
+def test_embedding_errors_reach_the_caller():
+    """Test that an error from the embedder is raised by get_or_compute."""
+    cache = CachedEmbedder(FakeEmbedder(error=ValueError("API unavailable")), FakeDB())
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("question")
+
+
+def test_wait_for_embedding_times_out():
+    """Test that a stuck embedding request doesn't block the caller forever."""
+    gate = threading.Event()
+    embedder = FakeEmbedder(gate=gate)
+    cache = CachedEmbedder(embedder, FakeDB(), timeout=0.1)
+
+    try:
+        with pytest.raises(TimeoutError):
+            cache.get_or_compute("question")
+    finally:
+        gate.set()
@@ -0,0 +1,113 @@
+"""Tests for the EMQX API helpers."""
+
+import time
+
+import jwt
+import orjson
+import pytest
+import requests
+
+from app.utils import emqx_api
+
+ENDPOINT = "http://emqx:18083"
+SIGNING_KEY = "emqx-dashboard-test-signing-key!"
+
+
+class FakeResponse:
+    """HTTP response with a JSON body."""
+
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.content = orjson.dumps(body)
+        self.text = self.content.decode()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+def make_token(username, expires_in):
+    """Create a JWT like the ones returned by the EMQX login API."""
+    payload = {"sub": username, "exp": int(time.time()) + expires_in}
+    return jwt.encode(payload, SIGNING_KEY, algorithm="HS256")
+
+
+@pytest.fixture
+def logins(monkeypatch):
+    """Fake the login API, returning the queued tokens in turn."""
+    monkeypatch.setattr(emqx_api, "_token_cache", {})
+    tokens = []
+
+    def post(url, **kwargs):
+        assert url == f"{ENDPOINT}/api/v5/login"
+        return FakeResponse(200, {"token": tokens.pop(0)})
+
+    monkeypatch.setattr(emqx_api._SESSION, "post", post)
+    return tokens
+
+
+def test_token_is_reused_until_it_expires(logins):
+    """Test that a valid token is cached and an expiring one is replaced."""
+    first, second = make_token("first", 3600), make_token("second", 3600)
+    logins.extend([first, second])
+
+    assert emqx_api.emqx_login(ENDPOINT, "admin", "public") == first
+    assert emqx_api.emqx_login(f"{ENDPOINT}/", "admin", "public") == first
+    assert logins == [second]
+
+    # Tokens are renewed shortly before they expire
+    key = (ENDPOINT, "admin")
+    emqx_api._token_cache[key] = (first, emqx_api._token_expiry(make_token("first", 30)))
+    assert emqx_api.emqx_login(ENDPOINT, "admin", "public") == second
+
+
+def test_token_without_expiry_uses_default_lifetime(logins):
+    """Test that a token that isn't a JWT is still cached for a while."""
+    logins.append("opaque-token")
+
+    assert emqx_api.emqx_login(ENDPOINT, "admin", "public") == "opaque-token"
+    assert emqx_api.emqx_login(ENDPOINT, "admin", "public") == "opaque-token"
+
+    _, expires_at = emqx_api._token_cache[(ENDPOINT, "admin")]
+    assert (
+        expires_at > time.time() + emqx_api._DEFAULT_TOKEN_TTL - 2 * emqx_api._TOKEN_EXPIRY_MARGIN
+    )
+
+
+def test_rejected_token_is_renewed_once(logins, monkeypatch):
+    """Test that a 401 logs in again and retries the request once."""
+    old, new = make_token("old", 3600), make_token("new", 3600)
+    logins.extend([old, new])
+    responses = [FakeResponse(401), FakeResponse(200, [{"node": "emqx@127.0.0.1"}])]
+    sent_tokens = []
+
+    def request(method, url, headers=None, **kwargs):
+        sent_tokens.append(headers["Authorization"])
+        return responses.pop(0)
+
+    monkeypatch.setattr(emqx_api._SESSION, "request", request)
+
+    result = emqx_api.make_emqx_api_request(
+        ENDPOINT, "/api/v5/nodes", username="admin", password="public"
+    )
+
+    assert result == [{"node": "emqx@127.0.0.1"}]
+    assert sent_tokens == [f"Bearer {old}", f"Bearer {new}"]
+
+
+def test_repeated_rejection_fails(logins, monkeypatch):
+    """Test that a request rejected after the retry raises instead of looping."""
+    logins.extend([make_token("old", 3600), make_token("new", 3600)])
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        return FakeResponse(401)
+
+    monkeypatch.setattr(emqx_api._SESSION, "request", request)
+
+    with pytest.raises(Exception, match="401"):
+        emqx_api.make_emqx_api_request(
+            ENDPOINT, "/api/v5/nodes", username="admin", password="public"
+        )
+    assert len(calls) == 2
@@ -0,0 +1,39 @@
+"""Tests for the knowledge context helpers of the EMQX assistant."""
+
+from app.models.knowledge import KnowledgeEntry
+from app.services.emqx_assistant import format_context_entry, merge_extra_context
+
+
+def make_entry(entry_id, thread_ts, content="Restart the listener."):
+    """Create a knowledge entry for a thread."""
+    return KnowledgeEntry(
+        id=entry_id,
+        channel_id="C123",
+        thread_ts=thread_ts,
+        user_id="U123",
+        content=content,
+    )
+
+
+def test_supplied_entries_replace_their_stored_copy():
+    """Test that supplied entries come first, without a similarity."""
+    current = make_entry(None, "1.0")
+    stored_copy = make_entry(1, "1.0")
+    other = make_entry(2, "2.0")
+
+    merged = merge_extra_context([(stored_copy, 0.9), (other, 0.7)], [current])
+
+    assert merged == [(current, None), (other, 0.7)]
+
+
+def test_context_labels_supplied_entries():
+    """Test that a supplied entry isn't shown as a stored entry without an ID."""
+    current = make_entry(None, "1.0", content="The bridge keeps disconnecting.")
+    stored = make_entry(2, "2.0")
+
+    assert format_context_entry(current, None) == (
+        "**Current thread**:\nThe bridge keeps disconnecting.\n\n"
+    )
+    assert format_context_entry(stored, 0.75) == (
+        "**Entry 2** (Similarity: 0.75):\nRestart the listener.\n\n"
+    )
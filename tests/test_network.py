@@ -0,0 +1,39 @@
+"""Tests for the network diagnostic tools."""
+
+import socket
+from contextlib import closing
+
+import orjson
+from llama_index.core.tools import FunctionTool
+
+from app.utils.network import check_ports_available
+
+
+def test_check_ports_available_tool_schema():
+    """Test that the tool schema only uses types the OpenAI API accepts."""
+    tool = FunctionTool.from_defaults(fn=check_ports_available).metadata.to_openai_tool()
+
+    parameters = tool["function"]["parameters"]
+    assert parameters["properties"]["addresses"]["type"] == "array"
+    assert parameters["properties"]["addresses"]["items"] == {"type": "string"}
+    assert b"prefixItems" not in orjson.dumps(tool)
+
+
+def test_check_ports_available_tool_result():
+    """Test that each address gets a result under its own string key."""
+    with closing(socket.socket()) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        open_address = f"127.0.0.1:{server.getsockname()[1]}"
+
+        # A port that was just released has nothing listening on it
+        with closing(socket.socket()) as probe:
+            probe.bind(("127.0.0.1", 0))
+            closed_address = f"127.0.0.1:{probe.getsockname()[1]}"
+
+        tool = FunctionTool.from_defaults(fn=check_ports_available)
+        output = tool.call(addresses=[open_address, closed_address, "no-port"], timeout=1)
+
+    assert output.raw_output == {open_address: True, closed_address: False, "no-port": False}
+    # The result can be serialized for the tool message
+    orjson.loads(orjson.dumps(output.raw_output))
@@ -0,0 +1,99 @@
+"""Tests for the queued WebSocket sender."""
+
+import asyncio
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from app.api.websocket import WebSocketSender, coalesce_tokens
+
+
+class FakeWebSocket:
+    """WebSocket recording the frames sent to it."""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, data):
+        self.frames.append(orjson.loads(data))
+        # Yield so that more messages can queue up behind this frame
+        await asyncio.sleep(0)
+
+
+def test_coalesce_tokens():
+    """Test that only adjacent token messages are merged."""
+    messages = [
+        {"type": "status", "data": "Processing your message..."},
+        {"type": "token", "data": "Hello"},
+        {"type": "token", "data": ", world"},
+        {"type": "message_complete", "data": True},
+        {"type": "token", "data": "!"},
+    ]
+
+    assert coalesce_tokens(messages) == [
+        {"type": "status", "data": "Processing your message..."},
+        {"type": "token", "data": "Hello, world"},
+        {"type": "message_complete", "data": True},
+        {"type": "token", "data": "!"},
+    ]
+
+
+def test_sender_keeps_order_and_text():
+    """Test that queued messages arrive in order with no token text lost."""
+
+    async def run():
+        websocket = FakeWebSocket()
+        sender = WebSocketSender(websocket)
+        await sender.send({"type": "status", "data": "Starting new chat session..."})
+        for token in ["The ", "broker ", "is ", "running."]:
+            await sender.send({"type": "token", "data": token})
+        await sender.send({"type": "message_complete", "data": True})
+        await sender.close()
+        return websocket.frames
+
+    frames = asyncio.run(run())
+
+    assert frames[0]["type"] == "status"
+    assert frames[-1] == {"type": "message_complete", "data": True}
+    tokens = [frame["data"] for frame in frames if frame["type"] == "token"]
+    assert "".join(tokens) == "The broker is running."
+    # Tokens queued behind an in-flight frame share the next frame
+    assert len(tokens) < 4
+
+
+def test_unserializable_message_fails_only_its_send():
+    """Test that a bad payload raises to its caller and the connection goes on."""
+
+    async def run():
+        websocket = FakeWebSocket()
+        sender = WebSocketSender(websocket)
+        with pytest.raises(TypeError):
+            await sender.send({"type": "broker_info", "data": Decimal("1.5")})
+        # Non-string keys are accepted, as with json.dumps
+        await sender.send({"type": "broker_info", "data": {1: "node"}})
+        await sender.send({"type": "token", "data": "still open"})
+        await sender.close()
+        return websocket.frames
+
+    assert asyncio.run(run()) == [
+        {"type": "broker_info", "data": {"1": "node"}},
+        {"type": "token", "data": "still open"},
+    ]
+
+
+def test_send_fails_instead_of_blocking_when_socket_breaks():
+    """Test that a full queue doesn't hang producers after the socket fails."""
+
+    class BrokenWebSocket:
+        async def send_text(self, data):
+            raise ConnectionError("client went away")
+
+    async def run():
+        sender = WebSocketSender(BrokenWebSocket(), maxsize=1)
+        with pytest.raises(ConnectionError):
+            for _ in range(10):
+                await sender.send({"type": "status", "data": "Processing..."})
+        await sender.close()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))